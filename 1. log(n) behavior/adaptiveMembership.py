@@ -0,0 +1,263 @@
+"""
+    Membership container that chooses its own internal representation.
+
+    timingContains.py shows that checking membership in an unsorted list,
+    a sorted array or a hash set each wins for a different mix of size,
+    insertions and lookups. AdaptiveMembership counts the operations it
+    sees and, every so often, uses a simple cost model to estimate what the
+    recent workload would have cost in each representation. It switches
+    when the projected savings would outweigh the cost of rebuilding, and
+    records every switch (and why) in its history.
+"""
+import math
+import random
+import time
+import unittest
+
+from array import array
+from bisect import bisect_left
+
+LIST = 'list'
+SORTED = 'sorted'
+SET = 'set'
+
+class AdaptiveMembership:
+    """
+    Set of integers supporting add() and the 'in' operator, held as an
+    unsorted list, a sorted array('q') searched with bisect, or a set. In
+    every representation a value already present is not added again, so
+    the contents never depend on the representation.
+
+    The cost model uses rough CPython costs in nanoseconds, and the
+    approximate bytes per element of each representation so a memoryLimit
+    (in bytes) can rule out representations that are too large.
+    """
+    addCost = {
+        LIST   : lambda n: 8 * n + 25,
+        SORTED : lambda n: 40 * math.log2(n + 1) + 0.1 * n,
+        SET    : lambda n: 50,
+    }
+    lookupCost = {
+        LIST   : lambda n: 8 * n,
+        SORTED : lambda n: 40 * math.log2(n + 1),
+        SET    : lambda n: 40,
+    }
+    rebuildCost = {
+        LIST   : lambda n: 20 * n,
+        SORTED : lambda n: 20 * n * math.log2(n + 1),
+        SET    : lambda n: 50 * n,
+    }
+    bytesPerElement = { LIST : 40, SORTED : 8, SET : 75 }
+
+    # Weight given to the past when updating the moving averages
+    decay = 0.9
+
+    def __init__(self, values=(), window=128, memoryLimit=None):
+        self.window = window
+        self.memoryLimit = memoryLimit
+        self.representation = LIST
+        self.data = list(dict.fromkeys(values))
+        self.adds = 0
+        self.lookups = 0
+        self.windowAdds = 0
+        self.windowLookups = 0
+        self.averageAdds = None
+        self.averageLookups = None
+        self.history = []
+
+    def __len__(self):
+        return len(self.data)
+
+    def add(self, v):
+        """Add v to the collection, unless already present."""
+        self.adds += 1
+        self.windowAdds += 1
+        if self.representation == LIST:
+            if v not in self.data:
+                self.data.append(v)
+        elif self.representation == SET:
+            self.data.add(v)
+        else:
+            pos = bisect_left(self.data, v)
+            if pos == len(self.data) or self.data[pos] != v:
+                self.data.insert(pos, v)
+        self.observe()
+
+    def __contains__(self, v):
+        self.lookups += 1
+        self.windowLookups += 1
+        if self.representation == SORTED:
+            pos = bisect_left(self.data, v)
+            found = pos < len(self.data) and self.data[pos] == v
+        else:
+            found = v in self.data
+        self.observe()
+        return found
+
+    def counters(self):
+        """Return dictionary of operation counts and switches so far."""
+        return {
+            'representation' : self.representation,
+            'size'           : len(self.data),
+            'adds'           : self.adds,
+            'lookups'        : self.lookups,
+            'switches'       : len(self.history),
+        }
+
+    def estimate(self, representation, n):
+        """Return estimated nanoseconds for an average window in representation."""
+        return (self.averageAdds * self.addCost[representation](n) +
+                self.averageLookups * self.lookupCost[representation](n))
+
+    def observe(self):
+        """
+        Once per window, estimate the cost of an average window (a moving
+        average of the operations seen, so one unusual window does not cause
+        the representation to flip back and forth) in each representation
+        that fits within memoryLimit, and switch to the cheapest one if the
+        savings exceed the cost of rebuilding. Savings are projected by
+        assuming the workload will continue for as many windows as it
+        already has, so a small but steady advantage still leads to a switch
+        once enough operations have been seen.
+        """
+        if self.windowAdds + self.windowLookups < self.window:
+            return
+
+        if self.averageAdds is None:
+            self.averageAdds = self.windowAdds
+            self.averageLookups = self.windowLookups
+        else:
+            self.averageAdds = self.decay * self.averageAdds + (1 - self.decay) * self.windowAdds
+            self.averageLookups = self.decay * self.averageLookups + (1 - self.decay) * self.windowLookups
+
+        n = len(self.data)
+        costs = {}
+        for rep in [LIST, SORTED, SET]:
+            if self.memoryLimit is None or n * self.bytesPerElement[rep] <= self.memoryLimit:
+                costs[rep] = self.estimate(rep, n)
+        if not costs:
+            costs[SORTED] = self.estimate(SORTED, n)
+
+        best = min(costs, key=costs.get)
+        current = costs.get(self.representation, math.inf)
+        horizon = (self.adds + self.lookups) / self.window
+        if best != self.representation and (current - costs[best]) * horizon > self.rebuildCost[best](n):
+            reason = (f'{self.averageAdds:.1f} adds and {self.averageLookups:.1f} lookups per window at size {n}: '
+                      f'estimated {costs[best]:.0f}ns as {best} vs {current:.0f}ns as {self.representation}')
+            self.history.append({
+                'operation' : self.adds + self.lookups,
+                'from'      : self.representation,
+                'to'        : best,
+                'reason'    : reason,
+            })
+            self.switch(best)
+
+        self.windowAdds = 0
+        self.windowLookups = 0
+
+    def switch(self, representation):
+        """Rebuild the data in the given representation."""
+        if representation == LIST:
+            self.data = list(dict.fromkeys(self.data))
+        elif representation == SET:
+            self.data = set(self.data)
+        else:
+            self.data = array('q', sorted(set(self.data)))
+        self.representation = representation
+
+class AdaptiveMembershipTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def setUp(self):
+        self.numbers = random.sample(range(2 ** 24), 4096)
+
+    def testAddOnlySwitchesToSet(self):
+        # each add to a list must first scan it for the value
+        am = AdaptiveMembership(window=64)
+        for v in self.numbers:
+            am.add(v)
+        self.assertEqual(SET, am.representation)
+        self.assertEqual(len(self.numbers), len(am))
+
+    def testAddIgnoresDuplicates(self):
+        for representation in [LIST, SORTED, SET]:
+            am = AdaptiveMembership([3, 1, 3], window=math.inf)
+            am.switch(representation)
+            am.add(1)
+            am.add(2)
+            am.add(2)
+            self.assertEqual(3, len(am))
+            self.assertEqual([1, 2, 3], sorted(am.data))
+
+    def testLookupsSwitchToSet(self):
+        am = AdaptiveMembership(self.numbers, window=64)
+        for v in self.numbers[:256]:
+            self.assertTrue(v in am)
+        self.assertEqual(SET, am.representation)
+        self.assertEqual(LIST, am.history[0]['from'])
+        self.assertFalse(-1 in am)
+
+    def testMemoryLimitSwitchesToSorted(self):
+        am = AdaptiveMembership(self.numbers, window=64, memoryLimit=16 * len(self.numbers))
+        for v in self.numbers[:256]:
+            self.assertTrue(v in am)
+        self.assertEqual(SORTED, am.representation)
+
+        am.add(-5)
+        am.add(-5)
+        self.assertTrue(-5 in am)
+        self.assertEqual(len(self.numbers) + 1, len(am))
+        for v in self.numbers:
+            self.assertTrue(v in am)
+
+def outputTiming():
+    """
+    Generate timing report for workloads of 100,000 operations on N random
+    integers, comparing a fixed list, sorted array and set against
+    AdaptiveMembership, and showing the representation it ends with. The
+    workloads are mostly adds (1 lookup per 100 adds), mostly lookups (1 add
+    per 100 lookups), and mostly lookups with memory limited to 16 bytes for
+    each element that could be stored. The fixed list is not timed where it
+    would take minutes, since each add scans it for duplicates.
+    """
+    def workload(n, lookupsPer100):
+        random.seed(n)
+        initial = random.sample(range(2 ** 24), n)
+        ops = [(random.randint(0, 99) < lookupsPer100, random.randint(0, 2 ** 24)) for _ in range(100000)]
+        return initial, ops
+
+    def fixed(representation):
+        def create(initial, memoryLimit):
+            am = AdaptiveMembership(window=math.inf)
+            am.data = list(initial)
+            am.switch(representation)
+            return am
+        return create
+
+    builders = [fixed(LIST), fixed(SORTED), fixed(SET),
+                lambda initial, memoryLimit: AdaptiveMembership(initial, memoryLimit=memoryLimit)]
+    print ('Workload\tN\tList\t\tSorted\t\tSet\t\tAdaptive\tEnds As')
+    for name, lookupsPer100, limited in [('Adds', 1, False), ('Lookups', 99, False), ('Limited', 99, True)]:
+        for n in [2**_ for _ in range(4,15,5)]:
+            initial, ops = workload(n, lookupsPer100)
+            adds = sum(1 for isLookup, _ in ops if not isLookup)
+            memoryLimit = 16 * (n + adds) if limited else None
+            row = []
+            for build in builders:
+                if build is builders[0] and (n >= 2**14 or lookupsPer100 < 50):
+                    row.append('  ---   ')
+                    continue
+                am = build(initial, memoryLimit)
+                start = time.perf_counter()
+                for isLookup, v in ops:
+                    if isLookup:
+                        v in am
+                    else:
+                        am.add(v)
+                row.append(f'{time.perf_counter() - start:f}')
+            print (f'{name}\t\t{n}\t' + '\t'.join(row) + f'\t{am.representation}')
+
+if __name__ == '__main__':
+    outputTiming()
+    unittest.main()
@@ -0,0 +1,274 @@
+"""
+    Determine whether a binary file of 64-bit integers contains duplicate
+    values, and count its distinct values, when the file is too large to
+    fit in memory.
+
+    The file is read in chunks that fit within a memory budget. Each chunk
+    is sorted and written to a temporary file as a sorted run, after which
+    all runs are merged (k-way, using a heap) so that equal values become
+    adjacent. If there are too many runs to merge at once within the
+    budget, groups of runs are first merged into longer runs.
+
+    This completes in O(n log n) time using O(M) memory for a budget of M
+    bytes, plus O(n) temporary disk space.
+"""
+import heapq
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from array import array
+from itertools import islice
+from operator import eq
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Approximate bytes needed per value to sort a chunk in memory. Without NumPy
+# the chunk is read into an array, then sorted into a list of Python int
+# objects (8 bytes per reference, 32 per int and up to 4 for the merge).
+bytesPerValue = 8 if np is not None else 56
+
+# Smallest buffer (in values) used when reading or writing a run during a merge
+minimumBuffer = 512
+
+def writeIntegerFile(path, values, bufferValues=65536):
+    """
+    Write values, any iterable of integers, to path as 64-bit integers,
+    buffering bufferValues at a time.
+    """
+    with open(path, 'wb') as fp:
+        chunk = array('q')
+        for v in values:
+            chunk.append(v)
+            if len(chunk) == bufferValues:
+                chunk.tofile(fp)
+                chunk = array('q')
+        chunk.tofile(fp)
+
+def readValues(path, bufferValues):
+    """
+    Generate the integers in path, reading bufferValues at a time into the
+    same block. The file is unbuffered since it is already read in blocks,
+    so merging many runs does not also hold a file buffer for each.
+    """
+    block = array('q', [0]) * bufferValues
+    with open(path, 'rb', buffering=0) as fp:
+        while True:
+            size = fp.readinto(block)
+            if not size:
+                return
+            yield from islice(block, size // 8)
+
+def readSortedChunk(fp, chunkValues):
+    """Return up to chunkValues integers read from fp, sorted."""
+    if np is not None:
+        chunk = np.fromfile(fp, dtype=np.int64, count=chunkValues)
+        chunk.sort()
+        return chunk
+    block = array('q')
+    try:
+        block.fromfile(fp, chunkValues)
+    except EOFError:
+        pass
+    return sorted(block)
+
+def hasAdjacentDuplicate(chunk):
+    """Return True if sorted chunk contains two equal adjacent values."""
+    if np is not None and isinstance(chunk, np.ndarray):
+        return bool(np.any(chunk[1:] == chunk[:-1]))
+    return any(map(eq, chunk, islice(chunk, 1, None)))
+
+def writeRun(directory, values, bufferValues):
+    """
+    Write sorted values (a chunk, or a generator of merged values which is
+    written as it is consumed) to a new file in directory and return its
+    path. A list is written bufferValues at a time, so it is never copied
+    whole.
+    """
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    os.close(fd)
+    if np is not None and isinstance(values, np.ndarray):
+        values.tofile(path)
+    elif isinstance(values, list):
+        with open(path, 'wb') as fp:
+            for i in range(0, len(values), bufferValues):
+                array('q', values[i:i+bufferValues]).tofile(fp)
+    else:
+        writeIntegerFile(path, values, bufferValues)
+    return path
+
+def writeSortedRuns(path, memoryBytes, directory, checkDuplicates=False):
+    """
+    Sort each chunk of path that fits within memoryBytes and write it as a
+    run in directory. Return list of the runs, or None if checkDuplicates
+    is True and some chunk contains a duplicate. Only one chunk is held in
+    memory at a time.
+    """
+    chunkValues = max(1, memoryBytes // bytesPerValue)
+    runs = []
+    with open(path, 'rb') as fp:
+        while True:
+            chunk = readSortedChunk(fp, chunkValues)
+            if len(chunk) == 0:
+                return runs
+            if checkDuplicates and hasAdjacentDuplicate(chunk):
+                return None
+            runs.append(writeRun(directory, chunk, minimumBuffer))
+            del chunk
+
+def mergeFanIn(memoryBytes):
+    """
+    Return the most runs that can be merged at once within memoryBytes, where
+    each run needs a buffer of minimumBuffer values, as does the block being
+    read into it and (twice, since it is copied to be written) the run being
+    written.
+    """
+    return max(2, memoryBytes // (8 * minimumBuffer) - 3)
+
+def mergeRuns(runs, memoryBytes, directory, fanIn=None):
+    """
+    Generate values of all sorted runs in ascending order. At most fanIn
+    runs (by default from mergeFanIn) are merged at once, each read through
+    a buffer that shares the memory budget with the buffer used to write
+    the merged run, so more runs are first merged in groups into new runs.
+    """
+    fanIn = fanIn or mergeFanIn(memoryBytes)
+    while len(runs) > fanIn:
+        merged = []
+        for i in range(0, len(runs), fanIn):
+            group = runs[i:i+fanIn]
+            bufferValues = max(minimumBuffer, memoryBytes // (8 * (len(group) + 3)))
+            path = writeRun(directory, mergeRuns(group, memoryBytes, directory, fanIn), bufferValues)
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        runs = merged
+
+    bufferValues = max(minimumBuffer, memoryBytes // (8 * (len(runs) + 2)))
+    return heapq.merge(*[readValues(run, bufferValues) for run in runs])
+
+def uniqueCheckExternal(path, memoryBytes=2**26, directory=None):
+    """
+    Return True if the file of 64-bit integers at path contains duplicates,
+    using about memoryBytes of memory and temporary files in directory
+    (the system default if None). A duplicate within a single chunk is
+    reported as soon as that chunk is sorted.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        runs = writeSortedRuns(path, memoryBytes, tmp, checkDuplicates=True)
+        if runs is None:
+            return True
+
+        prior = None
+        for v in mergeRuns(runs, memoryBytes, tmp):
+            if v == prior:
+                return True
+            prior = v
+    return False
+
+def distinctCountExternal(path, memoryBytes=2**26, directory=None):
+    """
+    Return the exact number of distinct values in the file of 64-bit
+    integers at path, using about memoryBytes of memory and temporary files
+    in directory (the system default if None).
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        runs = writeSortedRuns(path, memoryBytes, tmp)
+
+        count = 0
+        prior = None
+        for v in mergeRuns(runs, memoryBytes, tmp):
+            if v != prior or count == 0:
+                count += 1
+            prior = v
+    return count
+
+class ExternalUniqueTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'numbers.bin')
+        self.numbers = random.sample(range(2 ** 40), 5000)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testNoDuplicates(self):
+        writeIntegerFile(self.path, self.numbers)
+        self.assertFalse(uniqueCheckExternal(self.path, 4096, self.directory))
+        self.assertEqual(5000, distinctCountExternal(self.path, 4096, self.directory))
+
+    def testDuplicatesAcrossRuns(self):
+        writeIntegerFile(self.path, self.numbers + [self.numbers[0]])
+        self.assertTrue(uniqueCheckExternal(self.path, 4096, self.directory))
+
+        writeIntegerFile(self.path, self.numbers * 3)
+        self.assertEqual(5000, distinctCountExternal(self.path, 4096, self.directory))
+
+    def testMultiPassMerge(self):
+        runs = [writeRun(self.directory, sorted(self.numbers[i:i+10]), minimumBuffer) for i in range(0, 5000, 10)]
+        self.assertEqual(sorted(self.numbers), list(mergeRuns(runs, 4096, self.directory, fanIn=4)))
+
+    def testMemoryBudget(self):
+        writeIntegerFile(self.path, random.sample(range(2 ** 40), 2 ** 17))
+        for memoryBytes in [2**16, 2**18]:
+            tracemalloc.start()
+            self.assertFalse(uniqueCheckExternal(self.path, memoryBytes, self.directory))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertLess(peak, 1.5 * memoryBytes)
+
+    def testEmpty(self):
+        writeIntegerFile(self.path, [])
+        self.assertFalse(uniqueCheckExternal(self.path))
+        self.assertEqual(0, distinctCountExternal(self.path))
+
+def outputTiming():
+    """
+    Generate timing report comparing uniqueCheckSet (after loading the whole
+    file into memory) against uniqueCheckExternal with a 1MB budget on files
+    of N distinct random integers, showing seconds and the peak memory (in
+    bytes, as reported by tracemalloc) for each.
+    """
+    from timing import uniqueCheckSet
+
+    def loadAndCheck(path):
+        values = array('q')
+        with open(path, 'rb') as fp:
+            values.frombytes(fp.read())
+        return uniqueCheckSet(values)
+
+    directory = tempfile.mkdtemp()
+    try:
+        print ('N\tSet\t\tSet Bytes\tExternal\tExternal Bytes')
+        for trial in [2**_ for _ in range(12,23,2)]:
+            path = os.path.join(directory, f'numbers{trial}.bin')
+            random.seed(trial)
+            writeIntegerFile(path, random.sample(range(2 ** 40), trial))
+
+            row = []
+            for check in [loadAndCheck, lambda p: uniqueCheckExternal(p, 2**20, directory)]:
+                tracemalloc.start()
+                start = time.perf_counter()
+                check(path)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                row.append(f'{elapsed:f}\t{peak}')
+            print (f'{trial}\t' + '\t'.join(row))
+            os.remove(path)
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    outputTiming()
+    unittest.main()
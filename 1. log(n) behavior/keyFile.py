@@ -0,0 +1,235 @@
+"""
+    Check membership against a sorted collection of integers that is far
+    larger than memory, by writing the keys once to a binary file and
+    searching it in place through mmap.
+
+    The file stores each key as a 64-bit integer in native byte order. A
+    sidecar file (with the '.idx' suffix) stores N, the size and modification
+    time of the key file it was built from, and every Nth key, which is
+    small enough to load in milliseconds even for a billion keys. Each
+    search first uses this sparse index to find the one block of N keys
+    that could contain the target, so only that block's pages are touched.
+"""
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import timeit
+import unittest
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+# 512 64-bit keys fill one 4096-byte page
+defaultStride = 512
+
+def writeKeyFile(path, keys, stride=defaultStride):
+    """
+    Write keys, which can be any iterable of sorted integers, to path along
+    with a sparse index of every stride-th key in path + '.idx'. Keys are
+    written in chunks so the full collection is never held in memory.
+    """
+    sparse = array('q')
+    chunk = array('q')
+    count = 0
+    prior = None
+    with open(path, 'wb') as fp:
+        for k in keys:
+            if prior is not None and k < prior:
+                raise ValueError(f'keys are not sorted: {k} follows {prior}')
+            prior = k
+            if count % stride == 0:
+                sparse.append(k)
+            chunk.append(k)
+            count += 1
+            if len(chunk) == 65536:
+                chunk.tofile(fp)
+                chunk = array('q')
+        chunk.tofile(fp)
+
+    info = os.stat(path)
+    with open(path + '.idx', 'wb') as fp:
+        array('q', [stride, info.st_size, info.st_mtime_ns]).tofile(fp)
+        sparse.tofile(fp)
+
+class KeyFile:
+    """
+    Sorted key file opened through mmap and viewed as an array of 64-bit
+    integers, so searching allocates no buffers and reads only the pages
+    it needs. The stride is read from the sparse index file; only if that
+    file is missing or was not built from this key file (its recorded size
+    and modification time differ) is the index rebuilt with the given
+    stride, which touches every page once. Raises ValueError if the size
+    of the key file is not a multiple of 8 bytes.
+    """
+    def __init__(self, path, stride=defaultStride):
+        self.fp = open(path, 'rb')
+        self.info = os.fstat(self.fp.fileno())
+        if self.info.st_size % 8:
+            self.fp.close()
+            raise ValueError(f'{path} holds {self.info.st_size} bytes, which is not a whole number of 64-bit keys.')
+        self.n = self.info.st_size // 8
+        self.stride = None
+        self.mm = None
+        self.keys = []
+        if self.n:
+            self.mm = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self.keys = memoryview(self.mm).cast('q')
+
+        self.sparse = self.loadSparseIndex(path + '.idx')
+        if self.sparse is None:
+            self.stride = stride
+            self.sparse = array('q', self.keys[::stride])
+
+    def loadSparseIndex(self, indexPath):
+        """
+        Return sparse index from indexPath, setting stride from its header,
+        or None if unusable or built from a different key file.
+        """
+        try:
+            with open(indexPath, 'rb') as fp:
+                sparse = array('q', fp.read())
+        except (FileNotFoundError, ValueError):
+            return None
+        if len(sparse) < 3 or sparse[0] < 1:
+            return None
+        stride, size, mtime = sparse[:3]
+        if (size, mtime) != (self.info.st_size, self.info.st_mtime_ns):
+            return None
+        if len(sparse) - 3 != (self.n + stride - 1) // stride:
+            return None
+        self.stride = stride
+        return sparse[3:]
+
+    def __contains__(self, tgt):
+        block = bisect_right(self.sparse, tgt) - 1
+        if block < 0:
+            return False
+        lo = block * self.stride
+        hi = min(lo + self.stride, self.n)
+        pos = bisect_left(self.keys, tgt, lo, hi)
+        return pos < hi and self.keys[pos] == tgt
+
+    def __len__(self):
+        return self.n
+
+    def close(self):
+        """Release the memory view, the mapping and the file."""
+        if self.mm is not None:
+            self.keys.release()
+            self.mm.close()
+            self.mm = None
+        self.keys = []
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+class KeyFileTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'keys.bin')
+        self.numbers = sorted(random.randint(0, 2 ** 40) for _ in range(2000))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testContains(self):
+        writeKeyFile(self.path, self.numbers, stride=64)
+        with KeyFile(self.path, stride=64) as kf:
+            self.assertEqual(len(self.numbers), len(kf))
+            for v in self.numbers:
+                self.assertTrue(v in kf)
+            self.assertFalse(-1 in kf)
+            self.assertFalse(2 ** 41 in kf)
+            present = set(self.numbers)
+            for v in self.numbers:
+                if v + 1 not in present:
+                    self.assertFalse(v + 1 in kf)
+
+    def testStoredStride(self):
+        writeKeyFile(self.path, self.numbers, stride=64)
+        for stride in [defaultStride, 100]:
+            with KeyFile(self.path, stride) as kf:
+                self.assertEqual(64, kf.stride)
+                self.assertEqual(32, len(kf.sparse))
+                self.assertTrue(self.numbers[-1] in kf)
+
+    def testRebuildSparseIndex(self):
+        writeKeyFile(self.path, self.numbers, stride=64)
+        os.remove(self.path + '.idx')
+        with KeyFile(self.path, stride=100) as kf:
+            self.assertEqual(100, kf.stride)
+            self.assertEqual(20, len(kf.sparse))
+            self.assertTrue(self.numbers[-1] in kf)
+
+        writeKeyFile(self.path + '.other', self.numbers[:1000], stride=64)
+        os.replace(self.path + '.other.idx', self.path + '.idx')
+        with KeyFile(self.path) as kf:
+            self.assertEqual(defaultStride, kf.stride)
+            self.assertEqual(4, len(kf.sparse))
+
+    def testStaleSparseIndex(self):
+        writeKeyFile(self.path, self.numbers, stride=64)
+        shifted = [v + 1 for v in self.numbers]
+        writeKeyFile(self.path + '.other', shifted, stride=64)
+        os.replace(self.path + '.other', self.path)
+        with KeyFile(self.path, stride=100) as kf:
+            self.assertEqual(100, kf.stride)
+            self.assertTrue(all(v in kf for v in shifted))
+
+    def testPartialKey(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(bytes(12))
+        with self.assertRaises(ValueError):
+            KeyFile(self.path)
+
+    def testEmpty(self):
+        writeKeyFile(self.path, [])
+        with KeyFile(self.path) as kf:
+            self.assertEqual(0, len(kf))
+            self.assertFalse(0 in kf)
+
+    def testUnsorted(self):
+        with self.assertRaises(ValueError):
+            writeKeyFile(self.path, [3, 2, 1])
+
+def outputTiming():
+    """
+    Generate timing report comparing the cost to get started, either by
+    rebuilding a sorted list of N random integers (as timingContains.py
+    does) or by opening an existing KeyFile, followed by the time for
+    10000 searches using BinaryArraySearch on the list and the KeyFile.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        print ('N\tBuild\t\tOpen\t\tBinaryArraySearch\tKeyFile')
+        for trial in [2**_ for _ in range(10,23,2)]:
+            path = os.path.join(directory, f'keys{trial}.bin')
+            random.seed(trial)
+            writeKeyFile(path, sorted(random.randint(0, 2 ** 40) for _ in range(trial)))
+
+            build = timeit.timeit(stmt=f'sorted([random.randint(0, 2 ** 40) for _ in range({trial})])',
+                        number=1, setup=f'import random\nrandom.seed({trial})')
+            start = timeit.timeit(stmt=f'KeyFile({path!r}).close()', number=1,
+                        globals=globals())
+            search = timeit.timeit(stmt='binaryArraySearch(numbers, random.randint(0, 2 ** 40))', number=10000,
+                        setup=f'import random\nfrom timingContains import binaryArraySearch\nrandom.seed({trial})\nnumbers = sorted(random.randint(0, 2 ** 40) for _ in range({trial}))')
+            with KeyFile(path) as kf:
+                lookup = timeit.timeit(stmt='random.randint(0, 2 ** 40) in kf', number=10000,
+                        setup='import random', globals={ 'kf' : kf })
+
+            print (f'{trial}\t{build:f}\t{start:f}\t{search:f}\t\t{lookup:f}')
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    outputTiming()
+    unittest.main()
@@ -13,14 +13,89 @@
     
     Author: George Heineman
 """
+import math
+import multiprocessing
+import os
 import random
+import time
 import timeit
+import tracemalloc
 import unittest
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Native struct codes of the integer and floating point buffers that can be read in place
+numericFormats = 'bBhHiIlLqQnNfd'
+
+def asTypedBuffer(data):
+    """
+    Return a one-dimensional memoryview over data, without copying, if it
+    supports the buffer protocol (array.array, bytes, bytearray, mmap or a
+    NumPy array) with native numeric values, otherwise None (as for lists,
+    array('u') or ctypes arrays, whose format has a byte-order prefix) so
+    that the caller iterates over data instead. A multi-dimensional buffer
+    that is not C-contiguous (such as a transposed NumPy array) is copied
+    into one that is when NumPy is available, otherwise None is returned.
+    """
+    if isinstance(data, list):
+        return None
+    try:
+        buffer = memoryview(data)
+    except TypeError:
+        return None
+    if len(buffer.format) != 1 or buffer.format not in numericFormats:
+        return None
+    if buffer.ndim != 1:
+        if buffer.c_contiguous:
+            buffer = buffer.cast('B').cast(buffer.format)
+        elif np is not None:
+            buffer = memoryview(np.ravel(data))
+        else:
+            return None
+    return buffer
+
+def bufferHasDuplicate(buffer):
+    """
+    Return True if the values in buffer contain a duplicate. With NumPy the
+    values are sorted so any duplicates are adjacent, otherwise the number
+    of distinct values is compared with the number of values.
+    """
+    if np is not None:
+        values = np.sort(np.asarray(buffer))
+        return bool(np.any(values[1:] == values[:-1]))
+    return len(set(buffer)) != len(buffer)
+
+def bufferSum(buffer):
+    """
+    Return the sum of the values in buffer, computed by NumPy (using 64-bit
+    accumulators, so single-precision floats are summed in double precision
+    as the built-in sum does) or else the built-in sum. Since a 64-bit
+    accumulator can overflow when the values are themselves 64-bit integers,
+    these are always summed exactly by the built-in sum.
+    """
+    if np is not None and not (buffer.format[-1] in 'qQlLnN' and buffer.itemsize == 8):
+        values = np.asarray(buffer)
+        if values.dtype.kind == 'f':
+            return values.sum(dtype=np.float64).item()
+        return values.sum().item()
+    return sum(buffer)
+
 def sumValues(aList):
     """
-    Return the sum of the values in the list.
+    Return the sum of the values in the list. A typed buffer is summed
+    in place by bufferSum.
     """
+    buffer = asTypedBuffer(aList)
+    if buffer is not None:
+        return bufferSum(buffer)
+
     sum = 0
     for d in aList:
         sum += d
@@ -30,8 +105,13 @@ def uniqueCheckSet(aList):
     """
     Return True if aList contains any duplicates. Its contents are not
     altered and completes in O(n) time with O(n) space required. The
-    individual elements must be hashable.
+    individual elements must be hashable. A typed buffer is checked in
+    place by bufferHasDuplicate.
     """
+    buffer = asTypedBuffer(aList)
+    if buffer is not None:
+        return bufferHasDuplicate(buffer)
+
     check = set()
     for v in aList:
         if v in check:
@@ -44,6 +124,7 @@ def uniqueCheckLoop(aList):
     Return True if aList contains any duplicates. Its contents are not
     altered and completes in O(n^2) time with no space required. 
     """
+    aList = asTypedBuffer(aList) or aList
     n = len(aList)
     for i in range(n-1):
         for j in range(i+1, n):
@@ -57,6 +138,7 @@ def uniqueCheckString(aList):
     altered. A single string is constructed of the form ",13,245,18," which
     contains three values seen so far (i.e., 13, 245 and 18) in comma-separated form.
     """
+    aList = asTypedBuffer(aList) or aList
     check = ','
     for v in aList:
         if f',{v},' in check:
@@ -64,12 +146,253 @@ def uniqueCheckString(aList):
         check = f'{check}{v},'
     return False
 
+def uniqueCheckBatch(batches, offsets=None):
+    """
+    Return a list of booleans, one per batch, where each is True if that
+    batch contains any duplicates. Either pass a list of lists, or pass one
+    flat list or buffer (NumPy array or array.array) with offsets, in which
+    case batch i is batches[offsets[i]:offsets[i+1]].
+
+    With NumPy every batch is sorted at once by (batch, value) so duplicates
+    become adjacent and are found in a single vectorized comparison, which
+    completes in O(n log n) time for n total values. Otherwise, or when the
+    values are not all integers that NumPy can hold exactly (such as floats,
+    strings or integers of 2**64 or more), each batch is checked by
+    comparing its length against the size of its set.
+    """
+    values = None
+    if offsets is None:
+        lengths = [len(b) for b in batches]
+        if np is not None and batches:
+            arrays = [np.asarray(b) for b in batches if len(b)]
+            if all(a.dtype.kind in 'iu' for a in arrays):
+                values = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+        if values is None or values.dtype.kind not in 'iu':
+            return [len(set(b)) != n for b, n in zip(batches, lengths)]
+    else:
+        lengths = [offsets[i+1] - offsets[i] for i in range(len(offsets)-1)]
+        if np is not None:
+            values = np.asarray(batches)[offsets[0]:offsets[-1]]
+        if values is None or values.dtype.kind not in 'iu':
+            return [len(set(batches[offsets[i]:offsets[i+1]])) != lengths[i]
+                    for i in range(len(lengths))]
+
+    ids = np.repeat(np.arange(len(lengths)), lengths)
+    order = np.lexsort((values, ids))
+    values = values[order]
+    same = (values[1:] == values[:-1]) & (ids[1:] == ids[:-1])
+    flags = np.zeros(len(lengths), dtype=bool)
+    flags[ids[1:][same]] = True
+    return flags.tolist()
+
+class BloomFilter:
+    """
+    Bloom filter for integers using a fixed number of bytes, no matter how
+    many values are added. The number of hash functions is chosen from the
+    target false-positive rate, which holds until capacity() values have
+    been added; afterwards the rate grows as the bits fill up.
+    """
+    def __init__(self, numBytes, fpRate=0.01):
+        self.bits = bytearray(numBytes)
+        self.numBits = numBytes * 8
+        self.fpRate = fpRate
+        self.numHashes = max(1, round(-math.log2(fpRate)))
+
+    def capacity(self):
+        """Return number of values that can be added while meeting fpRate."""
+        return int(self.numBits * math.log(2) ** 2 / -math.log(self.fpRate))
+
+    def add(self, v):
+        """
+        Add integer v and return True if it was (probably) already present.
+        Uses double hashing so only one multiply is needed per value.
+        """
+        h = (v * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        pos = h % self.numBits
+        step = (h >> 32) | 1
+        bits = self.bits
+        present = True
+        for _ in range(self.numHashes):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                present = False
+            pos = (pos + step) % self.numBits
+        return present
+
+def uniqueCheckStream(stream, numBytes=2**20, fpRate=0.01, exact=False):
+    """
+    Return True if stream, which can be any iterable of integers, contains
+    duplicates using a BloomFilter of numBytes regardless of its length.
+    A False result is always correct, but a True result is a false positive
+    with probability of about fpRate per value.
+
+    With exact=True, every value that hits the filter is recorded as a
+    suspect, and a second pass over stream confirms whether any suspect
+    truly repeats, using a set that only holds suspects. This requires
+    stream to be re-iterable, such as a list, and not a one-shot iterator.
+    """
+    if exact and iter(stream) is stream:
+        raise ValueError('exact check requires a re-iterable stream')
+
+    bloom = BloomFilter(numBytes, fpRate)
+    suspects = set()
+    for v in stream:
+        if bloom.add(v):
+            if not exact:
+                return True
+            suspects.add(v)
+
+    if suspects:
+        seen = set()
+        for v in stream:
+            if v in suspects:
+                if v in seen:
+                    return True
+                seen.add(v)
+    return False
+
+# Set in each worker process so any worker can tell the others to stop early
+stopEvent = None
+
+def initPartitionWorker(event):
+    """Record the shared stop event in a worker process."""
+    global stopEvent
+    stopEvent = event
+
+# Fibonacci hashing multiplier, which mixes every bit of v into the high bits
+hashMultiplier = 0x9E3779B97F4A7C15
+mask64 = 2**64 - 1
+
+def partitionOf(v, parts):
+    """
+    Return partition (0 to parts-1) of integer v, taken from the middle bits
+    of v times hashMultiplier so that structured input (such as multiples
+    of parts) still spreads evenly.
+    """
+    return (((v * hashMultiplier) & mask64) >> 32) % parts
+
+def groupByPartition(values, out, parts):
+    """
+    Copy the 64-bit integers in values into out (a writable memoryview of
+    the same length) grouped by partitionOf, and return the list of parts
+    counts, so partition p occupies out[sum(counts[:p]):sum(counts[:p+1])].
+    """
+    if np is not None:
+        values = np.frombuffer(values, dtype=np.int64)
+        ids = (((values.astype(np.uint64) * np.uint64(hashMultiplier)) >> np.uint64(32))
+               % np.uint64(parts)).astype(np.intp)
+        np.frombuffer(out, dtype=np.int64)[:] = values[np.argsort(ids, kind='stable')]
+        return np.bincount(ids, minlength=parts).tolist()
+
+    buckets = [array('q') for _ in range(parts)]
+    for v in values.tolist():
+        buckets[(((v * hashMultiplier) & mask64) >> 32) % parts].append(v)
+    lo = 0
+    for bucket in buckets:
+        out[lo:lo + len(bucket)] = bucket
+        lo += len(bucket)
+    return [len(bucket) for bucket in buckets]
+
+def scatterSlice(inName, outName, lo, hi, parts):
+    """
+    Group the 64-bit integers at positions lo to hi of shared memory block
+    inName by partitionOf into the same positions of block outName, and
+    return the counts from groupByPartition.
+    """
+    source = shared_memory.SharedMemory(name=inName)
+    target = shared_memory.SharedMemory(name=outName)
+    values = source.buf.cast('q')
+    out = target.buf.cast('q')
+    try:
+        return groupByPartition(values[lo:hi], out[lo:hi], parts)
+    finally:
+        values.release()
+        out.release()
+        source.close()
+        target.close()
+
+def checkPartition(name, ranges, chunk=2**16):
+    """
+    Return True if the 64-bit integers in the (lo, hi) ranges of shared
+    memory block name (one partition from each scatterSlice) contain a
+    duplicate. The values are scanned in chunks, and the scan ends early
+    once any worker has set stopEvent after finding a duplicate.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    values = shm.buf.cast('q')
+    try:
+        check = set()
+        for lo, hi in ranges:
+            for start in range(lo, hi, chunk):
+                if stopEvent.is_set():
+                    return False
+                for v in values[start:min(start + chunk, hi)].tolist():
+                    if v in check:
+                        stopEvent.set()
+                        return True
+                    check.add(v)
+        return False
+    finally:
+        values.release()
+        shm.close()
+
+def uniqueCheckParallel(aList, workers=None):
+    """
+    Return True if aList of integers contains any duplicates, using a pool
+    of worker processes. The values are copied once into shared memory (so
+    they are never pickled). In the first phase, each worker groups its own
+    contiguous slice by a hash of each value (partitionOf) and returns the
+    count for each partition; the prefix sums of these counts locate the
+    range of every (worker, partition) pair. In the second phase, worker p
+    checks the ranges of partition p with a set, so any two equal values
+    meet in the same worker. Once a worker finds a duplicate, the others
+    stop at their next chunk.
+    """
+    workers = workers or os.cpu_count()
+    n = len(aList)
+    if n < 2:
+        return False
+
+    source = shared_memory.SharedMemory(create=True, size=8 * n)
+    target = shared_memory.SharedMemory(create=True, size=8 * n)
+    try:
+        buffer = source.buf.cast('q')
+        if np is not None:
+            np.frombuffer(buffer, dtype=np.int64)[:] = np.asarray(aList, dtype=np.int64)
+        else:
+            buffer[:] = array('q', aList)
+        buffer.release()
+
+        bounds = [n * w // workers for w in range(workers + 1)]
+        event = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=workers, initializer=initPartitionWorker,
+                                 initargs=(event,)) as pool:
+            futures = [pool.submit(scatterSlice, source.name, target.name, bounds[w], bounds[w+1], workers)
+                       for w in range(workers)]
+            counts = [f.result() for f in futures]
+
+            ranges = [[] for _ in range(workers)]
+            for w in range(workers):
+                lo = bounds[w]
+                for part in range(workers):
+                    ranges[part].append((lo, lo + counts[w][part]))
+                    lo += counts[w][part]
+
+            futures = [pool.submit(checkPartition, target.name, ranges[part])
+                       for part in range(workers)]
+            return any([f.result() for f in futures])
+    finally:
+        for shm in [source, target]:
+            shm.close()
+            shm.unlink()
+
 class TimingTest(unittest.TestCase):
     """
     Unit test cases to briefly validate methods.
     """
     def setUp(self):
-        noDuplicate = [random.randint(0, 2 ** 24) for _ in range(512)]
+        noDuplicate = random.sample(range(2 ** 24), 512)
         withDuplicate = list(noDuplicate) + [noDuplicate[len(noDuplicate)//2]]
         self.numbers = noDuplicate
         self.numbersWithDuplicate = withDuplicate
@@ -86,14 +409,115 @@ class TimingTest(unittest.TestCase):
         self.assertTrue(uniqueCheckLoop(self.numbersWithDuplicate))
         self.assertFalse(uniqueCheckLoop(self.numbers))
 
+    def testBuffers(self):
+        import mmap
+        values = array('q', self.numbers)
+        withDuplicate = array('q', self.numbersWithDuplicate)
+        self.assertEqual(sum(self.numbers), sumValues(values))
+        for meth in [uniqueCheckSet, uniqueCheckLoop, uniqueCheckString]:
+            self.assertFalse(meth(values))
+            self.assertTrue(meth(withDuplicate))
+
+        self.assertEqual(6, sumValues(bytes([1, 2, 3])))
+        self.assertTrue(uniqueCheckSet(bytearray(b'abca')))
+        mm = mmap.mmap(-1, 256)
+        mm.write(bytes(range(256)))
+        self.assertEqual(sum(range(256)), sumValues(mm))
+        self.assertFalse(uniqueCheckSet(mm))
+        self.assertFalse(uniqueCheckLoop(mm))
+        mm.close()
+
+        # buffers of characters or non-native formats are iterated instead
+        import ctypes
+        ints = (ctypes.c_int * 4)(1, 2, 3, 1)
+        self.assertEqual(7, sumValues(ints))
+        for meth in [uniqueCheckSet, uniqueCheckLoop, uniqueCheckString]:
+            self.assertTrue(meth(array('u', 'abca')))
+            self.assertFalse(meth(array('u', 'abc')))
+            self.assertTrue(meth(ints))
+
+        if np is not None:
+            grid = np.array(self.numbers).reshape(16, 32)
+            self.assertEqual(sum(self.numbers), sumValues(grid))
+            self.assertFalse(uniqueCheckSet(grid))
+            columns = np.arange(12).reshape(3, 4).T
+            self.assertEqual(66, sumValues(columns))
+            self.assertFalse(uniqueCheckSet(columns))
+            self.assertTrue(uniqueCheckSet(np.array([[1, 2], [2, 3]]).T))
+
+    def testLargeValues(self):
+        self.assertEqual(2**64, sumValues(array('q', [2**62] * 4)))
+        self.assertEqual(2**65, sumValues(array('Q', [2**63] * 4)))
+        self.assertEqual(sum(range(-5, 100)), sumValues(array('i', range(-5, 100))))
+        tenths = array('f', [0.1] * 10)
+        self.assertEqual(sumValues(list(tenths)), sumValues(tenths))
+        self.assertNotEqual(1.0, sumValues(tenths))
+
+    def testCheckBatch(self):
+        batches = [self.numbers, self.numbersWithDuplicate, [], [7, 7]]
+        self.assertEqual([False, True, False, True], uniqueCheckBatch(batches))
+
+        flat = array('q', self.numbers + self.numbersWithDuplicate)
+        offsets = [0, len(self.numbers), len(flat)]
+        self.assertEqual([False, True], uniqueCheckBatch(flat, offsets))
+
+        # values NumPy cannot hold exactly as integers are checked with sets
+        self.assertEqual([False, True, False], uniqueCheckBatch([[1.5, 1.2], [1.5, 1.5], [1]]))
+        self.assertEqual([False, True], uniqueCheckBatch([[2**64, 2**65], ['a', 'a']]))
+        self.assertEqual([False, False], uniqueCheckBatch([[2**63, 2**63 + 1], [-1]]))
+        self.assertEqual([False, True], uniqueCheckBatch(array('d', [1.5, 1.2, 0.5, 0.5]), [0, 2, 4]))
+
+        # a flat list can also be given with offsets
+        self.assertEqual([False, True], uniqueCheckBatch([1, 2, 3, 3], [0, 2, 4]))
+        self.assertEqual([False, False], uniqueCheckBatch([1, 2, 2, 3], [0, 2, 4]))
+        self.assertEqual([True, False], uniqueCheckBatch([1.5, 1.5, 2.0], [0, 2, 3]))
+        self.assertEqual([False, True], uniqueCheckBatch(self.numbers + self.numbersWithDuplicate,
+                                                         [0, len(self.numbers), len(flat)]))
+
+    def testCheckStream(self):
+        self.assertTrue(uniqueCheckStream(iter(self.numbersWithDuplicate)))
+        self.assertTrue(uniqueCheckStream(self.numbersWithDuplicate, exact=True))
+        self.assertFalse(uniqueCheckStream(self.numbers, exact=True))
+
+        # a tiny filter saturates, but exact check still rejects false positives
+        self.assertTrue(uniqueCheckStream(self.numbers, numBytes=8))
+        self.assertFalse(uniqueCheckStream(self.numbers, numBytes=8, exact=True))
+        with self.assertRaises(ValueError):
+            uniqueCheckStream(iter(self.numbers), exact=True)
+
+    def testCheckParallel(self):
+        self.assertTrue(uniqueCheckParallel(self.numbersWithDuplicate, 3))
+        self.assertFalse(uniqueCheckParallel(self.numbers, 3))
+        self.assertFalse(uniqueCheckParallel([], 2))
+
+    def testGroupByPartition(self):
+        values = array('q', [v * 7 + 3 for v in range(7000)] + [-5, -5])
+        out = memoryview(bytearray(8 * len(values))).cast('q')
+        counts = groupByPartition(memoryview(values), out, 7)
+        self.assertEqual(len(values), sum(counts))
+        self.assertEqual(sorted(values), sorted(out.tolist()))
+        lo = 0
+        for part in range(7):
+            bucket = out[lo:lo + counts[part]].tolist()
+            self.assertTrue(500 < len(bucket) < 1500)
+            self.assertTrue(all(partitionOf(v, 7) == part for v in bucket))
+            lo += counts[part]
+        self.assertTrue(uniqueCheckParallel(values, 7))
+        self.assertFalse(uniqueCheckParallel(values[:-1], 7))
+        self.assertTrue(uniqueCheckParallel(list(range(100)) + [0], 3))
+
 def outputTiming():
     """
     Generate timing report using random integers from 0 to 16777216,
     which greatly reduces the chance that a duplicate exists, thus
     ensuring the worst case scenario. Use random.seed(trial) to try
     to produce identical number sets across different approaches.
+
+    The Batch column checks 1000 lists of the same size with a single
+    call to uniqueCheckBatch, so it compares directly against the 1000
+    individual calls timed in the other columns.
     """
-    print ('N\tSum     \tSet\t        String\t        Loop')
+    print ('N\tSum     \tSet\t        String\t        Loop\t        Batch')
     for trial in [2**_ for _ in range(1,11)]:
         numbers = f'[random.randint(0, 2 ** 24) for _ in range({trial})]'
      
@@ -101,13 +525,107 @@ def outputTiming():
         counts = {}
         for meth in methods:
             counts[meth] = timeit.timeit(stmt=f'{meth}(numbers)', number=1000,
-                        setup=f'import random\nfrom __main__ import {meth}\nrandom.seed({trial})\nnumbers = {numbers}')
+                        setup=f'import random\nrandom.seed({trial})\nnumbers = {numbers}', globals=globals())
+        counts['uniqueCheckBatch'] = timeit.timeit(stmt='uniqueCheckBatch(batches)', number=1,
+                        setup=f'import random\nrandom.seed({trial})\nbatches = [{numbers} for _ in range(1000)]', globals=globals())
+        methods.append('uniqueCheckBatch')
 
         results = '\t'.join(f'{counts[meth]:f}' for meth in methods)
         print (f'{trial}\t{results}')
 
+def outputStreamTiming():
+    """
+    Generate throughput (millions of values per second) and peak memory
+    (in bytes, as reported by tracemalloc) for uniqueCheckSet against
+    uniqueCheckStream using a 1MB BloomFilter, on lists of random integers
+    from 0 to 2**40 which almost never contain duplicates. Set memory grows
+    with N while the BloomFilter memory stays fixed.
+    """
+    print ('N\tSet M/s\tSet Bytes\tBloom M/s\tBloom Bytes')
+    for trial in [2**_ for _ in range(10,21,2)]:
+        random.seed(trial)
+        numbers = [random.randint(0, 2 ** 40) for _ in range(trial)]
+
+        row = []
+        for meth in [uniqueCheckSet, uniqueCheckStream]:
+            elapsed = timeit.timeit(lambda: meth(numbers), number=5)
+            tracemalloc.start()
+            meth(numbers)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row.append(f'{5 * trial / elapsed / 1e6:.3f}\t{peak}')
+
+        print (f'{trial}\t' + '\t'.join(row))
+
+def registerBenchmarks(harness):
+    """Register duplicate detection methods with benchmark.py harness."""
+    numbers = lambda n: ([random.randint(0, 2 ** 24) for _ in range(n)],)
+    sizes = [2**_ for _ in range(2,11,2)]
+    for meth in [sumValues, uniqueCheckSet, uniqueCheckString, uniqueCheckLoop, uniqueCheckStream]:
+        harness.register('uniqueCheck', meth.__name__, meth, numbers, sizes, number=10)
+
+    batches = lambda n: ([[random.randint(0, 2 ** 24) for _ in range(n)] for _ in range(1000)],)
+    harness.register('uniqueCheck', 'uniqueCheckBatch', uniqueCheckBatch, batches, sizes)
+
+    typed = lambda n: (array('q', [random.randint(0, 2 ** 24) for _ in range(n)]),)
+    for meth in [sumValues, uniqueCheckSet]:
+        harness.register('uniqueCheck', f'{meth.__name__}-buffer', meth, typed, sizes, number=10)
+
+    distinct = lambda n: (random.sample(range(n * 8), n),)
+    for workers in [1, 2, 4]:
+        harness.register('uniqueCheckParallel', f'workers{workers}',
+                         lambda aList, workers=workers: uniqueCheckParallel(aList, workers),
+                         distinct, [2**20])
+
+def outputBufferTiming():
+    """
+    Generate timing report for sumValues and uniqueCheckSet when given the
+    same random integers as a list or as an array.array, which is checked
+    in place through the buffer protocol.
+    """
+    print ('N\tSum List\tSum Array\tSet List\tSet Array')
+    for trial in [2**_ for _ in range(10,21,2)]:
+        setup = f'import random\nfrom array import array\nrandom.seed({trial})\nnumbers = [random.randint(0, 2 ** 40) for _ in range({trial})]\nvalues = array("q", numbers)'
+        counts = [timeit.timeit(stmt=stmt, number=10, setup=setup, globals=globals())
+                  for stmt in ['sumValues(numbers)', 'sumValues(values)', 'uniqueCheckSet(numbers)', 'uniqueCheckSet(values)']]
+        results = '\t'.join(f'{c:f}' for c in counts)
+        print (f'{trial}\t{results}')
+
+def outputParallelTiming(n=10**8):
+    """
+    Generate timing report for uniqueCheckParallel on n distinct random
+    integers (the worst case, since no worker can stop early) using from
+    1 to os.cpu_count() workers, showing the speedup over checking the
+    same values serially with one set. The workers together hold all n
+    values in sets, so the default of 10**8 needs several GB of memory;
+    pass a smaller n on smaller machines.
+    """
+    random.seed(n)
+    if np is not None:
+        numbers = np.random.default_rng(n).permutation(n) * 7 + 3
+    else:
+        numbers = array('q', random.sample(range(n * 8), n))
+
+    print ('Workers\tSeconds\t\tSpeedup')
+    # Serial baseline with a set, since uniqueCheckSet would sort a NumPy array
+    start = time.perf_counter()
+    len(set(numbers.tolist())) != len(numbers)
+    baseline = time.perf_counter() - start
+    print (f'Set\t{baseline:f}\t1.00')
+    for workers in range(1, os.cpu_count() + 1):
+        start = time.perf_counter()
+        uniqueCheckParallel(numbers, workers)
+        elapsed = time.perf_counter() - start
+        print (f'{workers}\t{elapsed:f}\t{baseline / elapsed:.2f}')
+
 if __name__ == '__main__':
     outputTiming()
+    print()
+    outputStreamTiming()
+    print()
+    outputBufferTiming()
+    print()
+    outputParallelTiming(10**6)
     unittest.main()
     
 
@@ -8,6 +8,16 @@ import random
 import timeit
 import unittest
 
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from operator import le
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def contains(aList, tgt):
     """
     Use built-in 'in' operation as implementation.
@@ -41,6 +51,209 @@ def binaryArraySearch(aList, tgt):
             return True
     return False
 
+def isSorted(targets):
+    """Return True if targets are in ascending order."""
+    if np is not None and isinstance(targets, np.ndarray):
+        return bool(np.all(targets[1:] >= targets[:-1]))
+    return all(map(le, targets, islice(targets, 1, None)))
+
+def gallopContains(aList, targets):
+    """
+    Return bytearray with found[i] = 1 if sorted aList contains targets[i],
+    where targets are also sorted. Each search resumes where the previous
+    one ended, doubling its step until it passes the target and then using
+    binary search within the last step, which completes in O(m log(n/m))
+    time for m targets.
+    """
+    found = bytearray(len(targets))
+    n = len(aList)
+    lo = 0
+    for i, tgt in enumerate(targets):
+        bound = 1
+        while lo + bound < n and aList[lo + bound] < tgt:
+            bound *= 2
+        lo = bisect_left(aList, tgt, lo + bound // 2, min(lo + bound + 1, n))
+        if lo < n and aList[lo] == tgt:
+            found[i] = 1
+    return found
+
+def bisectContains(aList, targets):
+    """
+    Return bytearray with found[i] = 1 if sorted aList contains targets[i],
+    using an independent binary search for each target.
+    """
+    found = bytearray(len(targets))
+    n = len(aList)
+    for i, tgt in enumerate(targets):
+        pos = bisect_left(aList, tgt)
+        if pos < n and aList[pos] == tgt:
+            found[i] = 1
+    return found
+
+def searchSortedContains(aList, targets):
+    """
+    Return bytearray with found[i] = 1 if sorted aList contains targets[i],
+    locating all targets at once with NumPy searchsorted.
+    """
+    a = np.asarray(aList)
+    t = np.asarray(targets)
+    if len(a) == 0:
+        return bytearray(len(t))
+    pos = np.minimum(np.searchsorted(a, t), len(a) - 1)
+    return bytearray((a[pos] == t).view(np.uint8))
+
+def containsMany(aList, targets, strategy=None):
+    """
+    Return bytearray with found[i] = 1 if sorted aList contains targets[i]
+    and 0 otherwise. When strategy is None, one is chosen from the input:
+    sorted targets use 'gallop'; unsorted targets use 'searchsorted' when
+    NumPy is installed and 'bisect' otherwise.
+    """
+    if strategy is None:
+        if isSorted(targets):
+            strategy = 'gallop'
+        elif np is not None:
+            strategy = 'searchsorted'
+        else:
+            strategy = 'bisect'
+
+    if strategy == 'gallop':
+        return gallopContains(aList, targets)
+    if strategy == 'searchsorted':
+        return searchSortedContains(aList, targets)
+    if strategy == 'bisect':
+        return bisectContains(aList, targets)
+    raise ValueError(f'unknown strategy {strategy}')
+
+class SortedIndex:
+    """
+    Membership index built once from a sorted list of integers, with keys
+    stored in a compact array of 64-bit integers.
+
+    By default the keys are laid out in Eytzinger order, where the children
+    of position k are 2k and 2k+1 (just like a heap). The first levels of
+    every search then share a handful of cache lines, unlike binary search
+    on a sorted array which jumps across the whole array. If the keys appear
+    uniformly distributed, they are instead kept in sorted order and
+    searched by interpolation, which needs O(log log n) probes on average.
+    """
+    def __init__(self, aList, interpolate=None):
+        self.n = len(aList)
+        if interpolate is None:
+            interpolate = self.isUniform(aList)
+        self.interpolate = interpolate
+
+        if interpolate:
+            self.keys = array('q', aList)
+        else:
+            self.keys = array('q', bytes(8 * (self.n + 1)))
+            self.layout(aList)
+
+    @staticmethod
+    def isUniform(aList, samples=16, tolerance=0.1):
+        """
+        Return True if evenly spaced positions of sorted aList hold values
+        within tolerance of where a uniform distribution would place them.
+        """
+        n = len(aList)
+        if n < samples:
+            return False
+        lo = aList[0]
+        span = aList[-1] - lo
+        if span <= 0:
+            return False
+        for i in range(1, samples):
+            expected = lo + span * i / samples
+            if abs(aList[(n - 1) * i // samples] - expected) > tolerance * span:
+                return False
+        return True
+
+    def layout(self, aList):
+        """
+        Place sorted aList into Eytzinger order by visiting positions 1..n
+        of the implicit tree in order, without recursion.
+        """
+        keys = self.keys
+        n = self.n
+        k = 1
+        while 2*k <= n:
+            k *= 2
+        for v in aList:
+            keys[k] = v
+            if 2*k + 1 <= n:
+                k = 2*k + 1
+                while 2*k <= n:
+                    k *= 2
+            else:
+                while k & 1:
+                    k >>= 1
+                k >>= 1
+
+    def __contains__(self, tgt):
+        if self.interpolate:
+            return self.interpolationSearch(tgt)
+        return self.eytzingerSearch(tgt)
+
+    def __len__(self):
+        return self.n
+
+    def eytzingerSearch(self, tgt):
+        """
+        Descend the implicit tree without branching on the comparison, then
+        undo the final run of right turns to land on the smallest key that
+        is not less than tgt.
+        """
+        keys = self.keys
+        n = self.n
+        k = 1
+        while k <= n:
+            k = 2*k + (keys[k] < tgt)
+        k >>= (~k & (k+1)).bit_length()
+        return k > 0 and keys[k] == tgt
+
+    def interpolationSearch(self, tgt):
+        """
+        Probe where tgt would be if keys were evenly spread between the
+        current bounds. Falls back to binary search after too many probes
+        so skewed regions cannot degrade the search to O(n).
+        """
+        keys = self.keys
+        lo = 0
+        hi = self.n - 1
+        probes = 2 * self.n.bit_length()
+        while lo <= hi and keys[lo] <= tgt <= keys[hi]:
+            if probes == 0:
+                pos = bisect_left(keys, tgt, lo, hi + 1)
+                return keys[pos] == tgt
+            probes -= 1
+            span = keys[hi] - keys[lo]
+            if span == 0:
+                return keys[lo] == tgt
+            mid = lo + (tgt - keys[lo]) * (hi - lo) // span
+            if tgt < keys[mid]:
+                hi = mid - 1
+            elif tgt > keys[mid]:
+                lo = mid + 1
+            else:
+                return True
+        return False
+
+def randomTargets(aList, num, seed=0):
+    """
+    Return list of num targets in random order, half drawn from aList and
+    half random integers from 0 to 16777216 (almost all of them absent).
+    """
+    rng = random.Random(seed)
+    targets = [rng.choice(aList) for _ in range(num // 2)]
+    targets += [rng.randint(0, 2 ** 24) for _ in range(num - num // 2)]
+    rng.shuffle(targets)
+    return targets
+
+def searchAll(search, targets):
+    """Call search on every target in targets."""
+    for t in targets:
+        search(t)
+
 class TimingContainsTest(unittest.TestCase):
     """
     Unit test cases to briefly validate methods.
@@ -61,30 +274,131 @@ class TimingContainsTest(unittest.TestCase):
     def testCheckBinaryArraySearch(self):
         self.assertTrue(binaryArraySearch(self.numbers, self.target))
         self.assertFalse(binaryArraySearch(self.numbers, -1))
+
+    def testCheckContainsMany(self):
+        targets = [-1] + self.numbers[::3] + [v + 1 for v in self.numbers[::5]] + [2 ** 25]
+        expected = bytearray(1 if t in self.numbers else 0 for t in targets)
+        self.assertEqual(expected, containsMany(self.numbers, targets))
+        self.assertEqual(expected, containsMany(self.numbers, targets, 'bisect'))
+
+        targets.sort()
+        expected = bytearray(1 if t in self.numbers else 0 for t in targets)
+        self.assertEqual(expected, containsMany(self.numbers, targets))
+        self.assertEqual(bytearray(len(targets)), containsMany([], targets))
+        if np is not None:
+            self.assertEqual(expected, containsMany(self.numbers, targets, 'searchsorted'))
+
+    def testCheckSortedIndex(self):
+        missing = [-1, 2 ** 25] + [v + 1 for v in self.numbers if v + 1 not in self.numbers]
+        skewed = sorted(v * v for v in self.numbers[:100])
+        for interpolate in [True, False]:
+            for n in [0, 1, 2, 7, len(self.numbers)]:
+                index = SortedIndex(self.numbers[:n], interpolate)
+                for v in self.numbers[:n]:
+                    self.assertTrue(v in index)
+                for v in missing:
+                    self.assertFalse(v in index)
+
+        self.assertTrue(SortedIndex(self.numbers).interpolate)
+        self.assertFalse(SortedIndex(skewed).interpolate)
+
+        targets = randomTargets(self.numbers, 100)
+        self.assertEqual(100, len(targets))
+        self.assertTrue(50 <= sum(t in self.numbers for t in targets) < 100)
         
 
-def outputTiming():
+def outputTiming(maxExponent=15):
     """
     Generate timing report using random integers from 0 to 16777216,
     which greatly reduces the chance that a duplicate exists, thus
     ensuring the worst case scenario. Use random.seed(trial) to try
     to produce identical number sets across different approaches.
+
+    The last two columns search a SortedIndex forced to use its Eytzinger
+    layout and interpolation search, for 10000 random targets (half present
+    and half absent) rather than numbers[-1], which interpolation search
+    always finds on its first probe. Pass maxExponent=26 to extend the
+    table to 2**26 elements; the linear methods are not run beyond 2**15.
     """
-    print ('N\tContains\tSortContains\tBinaryArraySearch')
-    for trial in [2**_ for _ in range(1,16)]:
+    print ('N\tContains\tSortContains\tBinaryArraySearch\tEytzinger\tInterpolation')
+    for trial in [2**_ for _ in range(1,maxExponent+1)]:
         numbers = f'sorted([random.randint(0, 2 ** 24) for _ in range({trial})])'
      
         methods = ['contains', 'sortedContains', 'binaryArraySearch']
         counts = {}
         for meth in methods:
+            if trial > 2**15 and meth != 'binaryArraySearch':
+                counts[meth] = None
+                continue
             counts[meth] = timeit.timeit(stmt=f'{meth}(numbers, numbers[-1])', number=10000,
-                        setup=f'import random\nfrom __main__ import {meth}\nrandom.seed({trial})\nnumbers = {numbers}')
+                        setup=f'import random\nrandom.seed({trial})\nnumbers = {numbers}', globals=globals())
+        for meth,interpolate in [('eytzinger', False), ('interpolation', True)]:
+            counts[meth] = timeit.timeit(stmt='searchAll(index.__contains__, targets)', number=1,
+                        setup=f'import random\nrandom.seed({trial})\nnumbers = {numbers}\nindex = SortedIndex(numbers, {interpolate})\ntargets = randomTargets(numbers, 10000, {trial})', globals=globals())
+            methods.append(meth)
+
+        results = '\t'.join('  ---   ' if counts[meth] is None else f'{counts[meth]:f}' for meth in methods)
+        print (f'{trial}\t{results}')
 
-        results = '\t'.join(f'{counts[meth]:f}' for meth in methods)
+def outputBulkTiming():
+    """
+    Generate timing report for answering M membership queries against one
+    sorted list of 2**20 random integers, to show where each strategy of
+    containsMany overtakes calling binaryArraySearch once per target.
+    Gallop is timed on sorted targets; the rest on unsorted targets.
+    """
+    n = 2 ** 20
+    print ('M\tBinaryArraySearch\tBisect\t\tGallop\t\tSearchSorted')
+    for trial in [2**_ for _ in range(4,21,2)]:
+        setup = (f'import random\nrandom.seed({trial})\n'
+                 f'numbers = sorted(random.randint(0, 2 ** 24) for _ in range({n}))\n'
+                 f'targets = [random.randint(0, 2 ** 24) for _ in range({trial})]\n'
+                 f'sortedTargets = sorted(targets)')
+        stmts = ['[binaryArraySearch(numbers, t) for t in targets]',
+                 'containsMany(numbers, targets, "bisect")',
+                 'containsMany(numbers, sortedTargets, "gallop")']
+        if np is not None:
+            stmts.append('containsMany(numbers, targets, "searchsorted")')
+
+        counts = [timeit.timeit(stmt=stmt, number=5, setup=setup, globals=globals()) for stmt in stmts]
+        results = '\t'.join(f'{c:f}' for c in counts)
         print (f'{trial}\t{results}')
 
+def registerBenchmarks(harness):
+    """Register membership methods with benchmark.py harness."""
+    def numbers(n):
+        aList = sorted([random.randint(0, 2 ** 24) for _ in range(n)])
+        return (aList, aList[-1])
+    sizes = [2**_ for _ in range(4,17,4)]
+    for meth in [contains, sortedContains, binaryArraySearch]:
+        harness.register('contains', meth.__name__, meth, numbers, sizes, number=100)
+
+    def index(interpolate):
+        def setup(n):
+            aList, _ = numbers(n)
+            index = SortedIndex(aList, interpolate)
+            search = index.interpolationSearch if interpolate else index.eytzingerSearch
+            return (search, randomTargets(aList, 100))
+        return setup
+    harness.register('contains', 'eytzinger', searchAll, index(False), sizes)
+    harness.register('contains', 'interpolation', searchAll, index(True), sizes)
+
+    def bulk(strategy):
+        def setup(m):
+            aList = sorted(random.randint(0, 2 ** 24) for _ in range(2 ** 16))
+            targets = [random.randint(0, 2 ** 24) for _ in range(m)]
+            if strategy == 'gallop':
+                targets.sort()
+            return (aList, targets, strategy)
+        return setup
+    strategies = ['bisect', 'gallop'] + (['searchsorted'] if np is not None else [])
+    for strategy in strategies:
+        harness.register('containsMany', strategy, containsMany, bulk(strategy), [2**_ for _ in range(4,17,4)])
+
 if __name__ == '__main__':
     outputTiming()
+    print()
+    outputBulkTiming()
     unittest.main()
     
 
@@ -0,0 +1,251 @@
+"""
+    Microbenchmarks for the containers that can serve as a stack or queue.
+
+    Stacks: list (append/pop), deque (append/pop) and LifoQueue (put/get).
+    Queues: list (append/pop(0)), deque (append/popleft), Queue (put/get)
+    and RingBuffer (append/popleft).
+
+    Each container is wrapped as an Adapter that exposes bound push, pop
+    and peek methods, so every workload runs the same loop regardless of
+    the container. The workloads are:
+
+        PushPop    push N values, then pop all N
+        Peek       with N values stored, peek N times
+        Mixed      N random operations: 60% push, 30% pop, 10% peek
+        Bursty     four times, grow to N values and then shrink to empty
+        Contended  two producer threads push N values in total while two
+                   consumer threads pop them
+
+    Throughput is reported in operations per second for growing N, along
+    with the bytes per element (measured by tracemalloc) to hold N ints.
+"""
+import random
+import threading
+import time
+import tracemalloc
+import unittest
+
+from collections import deque
+from queue import LifoQueue, Queue
+
+from ringBuffer import RingBuffer
+
+class Adapter:
+    """
+    Wrap container (created by calling factory) with push, pop and peek
+    methods. threadSafe is False if the container cannot be shared between
+    threads.
+    """
+    def __init__(self, name, kind, factory, methods, threadSafe=True):
+        self.name = name
+        self.kind = kind
+        self.factory = factory
+        self.methods = methods
+        self.threadSafe = threadSafe
+
+    def create(self):
+        """Return (container, push, pop, peek) for a new, empty container."""
+        container = self.factory()
+        return (container,) + self.methods(container)
+
+adapters = [
+    Adapter('list', 'stack', list, lambda c: (c.append, c.pop, lambda: c[-1])),
+    Adapter('deque', 'stack', deque, lambda c: (c.append, c.pop, lambda: c[-1])),
+    Adapter('LifoQueue', 'stack', LifoQueue, lambda c: (c.put, c.get, lambda: c.queue[-1])),
+    Adapter('list', 'queue', list, lambda c: (c.append, lambda: c.pop(0), lambda: c[0])),
+    Adapter('deque', 'queue', deque, lambda c: (c.append, c.popleft, lambda: c[0])),
+    Adapter('Queue', 'queue', Queue, lambda c: (c.put, c.get, lambda: c.queue[0])),
+    Adapter('RingBuffer', 'queue', RingBuffer, lambda c: (c.append, c.popleft, c.peek), threadSafe=False),
+]
+
+# Largest N for which list.pop(0) is timed, since each pop is O(N)
+listQueueLimit = 2**16
+
+def pushPop(adapter, n):
+    """Push n values, then pop them all. Return number of operations."""
+    _, push, pop, _ = adapter.create()
+    for v in range(n):
+        push(v)
+    for _ in range(n):
+        pop()
+    return 2 * n
+
+def peek(adapter, n):
+    """
+    Peek n times at a container holding n values. Return (operations,
+    seconds) so that filling the container is not part of the timing.
+    """
+    _, push, _, peek = adapter.create()
+    for v in range(n):
+        push(v)
+    start = time.perf_counter()
+    for _ in range(n):
+        peek()
+    return n, time.perf_counter() - start
+
+def mixedOperations(n, seed=0):
+    """Return list of n operations (0 push, 1 pop, 2 peek) that never pop or peek when empty."""
+    rng = random.Random(seed)
+    ops = []
+    size = 0
+    for _ in range(n):
+        r = rng.random()
+        if size == 0 or r < 0.6:
+            ops.append(0)
+            size += 1
+        elif r < 0.9:
+            ops.append(1)
+            size -= 1
+        else:
+            ops.append(2)
+    return ops
+
+def mixed(adapter, ops):
+    """Perform ops from mixedOperations. Return number of operations."""
+    _, push, pop, peek = adapter.create()
+    for v, op in enumerate(ops):
+        if op == 0:
+            push(v)
+        elif op == 1:
+            pop()
+        else:
+            peek()
+    return len(ops)
+
+def bursty(adapter, n, bursts=4):
+    """Grow to n values then shrink to empty, bursts times. Return number of operations."""
+    _, push, pop, _ = adapter.create()
+    for _ in range(bursts):
+        for v in range(n):
+            push(v)
+        for _ in range(n):
+            pop()
+    return 2 * n * bursts
+
+def share(n, parts, i):
+    """Return size of part i when n is divided into parts that differ by at most one."""
+    return n // parts + (1 if i < n % parts else 0)
+
+def contended(adapter, n, producers=2, consumers=2):
+    """
+    Have producer threads push n values in total while consumer threads pop
+    them all, each thread taking its share of n. Consumers of a non-blocking
+    container retry when it is empty. Return number of operations.
+    """
+    _, push, pop, _ = adapter.create()
+
+    def produce(count):
+        for v in range(count):
+            push(v)
+
+    def consume(count):
+        while count:
+            try:
+                pop()
+                count -= 1
+            except IndexError:
+                time.sleep(0)
+
+    threads = [threading.Thread(target=produce, args=(share(n, producers, i),)) for i in range(producers)]
+    threads += [threading.Thread(target=consume, args=(share(n, consumers, i),)) for i in range(consumers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return 2 * n
+
+def bytesPerElement(adapter, n):
+    """Return bytes per element, measured by tracemalloc, for adapter holding n distinct ints."""
+    tracemalloc.start()
+    container, push, _, _ = adapter.create()
+    base = tracemalloc.get_traced_memory()[0]
+    for v in range(n, 2*n):
+        push(v)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return used / n
+
+def opsPerSecond(workload, *args):
+    """Return operations per second of workload(*args)."""
+    start = time.perf_counter()
+    result = workload(*args)
+    if isinstance(result, tuple):
+        return result[0] / result[1]
+    return result / (time.perf_counter() - start)
+
+def outputTiming(sizes=(2**10, 2**14, 2**18)):
+    """
+    Generate a table of ops/sec for each workload and a table of bytes per
+    element, with one row per container and one column per N.
+    """
+    workloads = [
+        ('PushPop',   lambda a, n: opsPerSecond(pushPop, a, n)),
+        ('Peek',      lambda a, n: opsPerSecond(peek, a, n)),
+        ('Mixed',     lambda a, n: opsPerSecond(mixed, a, mixedOperations(n))),
+        ('Bursty',    lambda a, n: opsPerSecond(bursty, a, n)),
+        ('Contended', lambda a, n: opsPerSecond(contended, a, n)),
+    ]
+    header = 'Container\t\t' + '\t\t'.join(str(n) for n in sizes)
+    for name, measure in workloads:
+        print (f'{name} (ops/sec)')
+        print (header)
+        for adapter in adapters:
+            row = []
+            for n in sizes:
+                if name == 'Contended' and not adapter.threadSafe:
+                    row.append('---')
+                elif adapter.name == 'list' and adapter.kind == 'queue' and n > listQueueLimit:
+                    row.append('---')
+                else:
+                    row.append(f'{measure(adapter, n):.0f}')
+            print (f'{adapter.name:<10} {adapter.kind}\t' + '\t\t'.join(row))
+        print ()
+
+    print ('Bytes per element')
+    print (header)
+    for adapter in adapters:
+        row = [f'{bytesPerElement(adapter, n):.1f}' for n in sizes]
+        print (f'{adapter.name:<10} {adapter.kind}\t' + '\t\t'.join(row))
+
+def registerBenchmarks(harness):
+    """Register the PushPop and Mixed workloads of each container with benchmark.py harness."""
+    for adapter in adapters:
+        key = f'{adapter.name}-{adapter.kind}'
+        harness.register('containers', key + '/PushPop', pushPop,
+                         lambda n, a=adapter: (a, n), [2**10, 2**14])
+        harness.register('containers', key + '/Mixed', mixed,
+                         lambda n, a=adapter: (a, mixedOperations(n)), [2**10, 2**14])
+
+class ContainerBenchmarkTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def testWorkloads(self):
+        ops = mixedOperations(101)
+        self.assertEqual(101, len(ops))
+        for adapter in adapters:
+            self.assertEqual(202, pushPop(adapter, 101))
+            self.assertEqual(101, peek(adapter, 101)[0])
+            self.assertEqual(101, mixed(adapter, ops))
+            self.assertEqual(808, bursty(adapter, 101))
+            self.assertTrue(bytesPerElement(adapter, 101) > 0)
+
+    def testStackAndQueueOrder(self):
+        for adapter in adapters:
+            _, push, pop, peek = adapter.create()
+            for v in range(3):
+                push(v)
+            expected = 2 if adapter.kind == 'stack' else 0
+            self.assertEqual(expected, peek())
+            self.assertEqual(expected, pop())
+
+    def testContended(self):
+        self.assertEqual([34, 34, 33], [share(101, 3, i) for i in range(3)])
+        for adapter in adapters:
+            if adapter.threadSafe:
+                self.assertEqual(202, contended(adapter, 101, producers=2, consumers=3))
+                self.assertEqual(14, contended(adapter, 7, producers=3, consumers=2))
+
+if __name__ == '__main__':
+    outputTiming()
+    unittest.main()
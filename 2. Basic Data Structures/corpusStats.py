@@ -0,0 +1,197 @@
+"""
+    Compute statistics of word corpora (one or more words per line) too
+    large to process comfortably with a readline() loop, as justCount.py
+    does for the four-letter dictionary.
+
+    Each file is memory-mapped and split into chunks that end on a newline,
+    so no word is split between chunks. A pool of worker processes handles
+    the chunks, each mapping the file itself so the chunk is never pickled.
+    In a single pass, each worker counts the words of each length and the
+    frequency of each letter in each position, and collects the distinct
+    words it sees. These per-chunk results are then merged.
+
+    To keep the inner loops in C, the words of each length are joined into
+    a single bytes object, so the letters in position i of words of length
+    L are the slice [i::L], which bytes.count() tallies for each letter.
+
+    $ python3 corpusStats.py words.english.txt --workers 4
+"""
+import argparse
+import mmap
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Upper case letters, each of which is counted with bytes.count()
+letters = bytes(range(ord('A'), ord('Z') + 1))
+
+def chunkRanges(path, chunkBytes=2**24):
+    """
+    Return list of (start, end) byte offsets that split the file at path into
+    chunks of about chunkBytes, each ending just after a newline (or at the
+    end of the file).
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, 'rb') as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = min(start + chunkBytes, size)
+                if end < size:
+                    newline = mm.find(b'\n', end - 1)
+                    end = size if newline < 0 else newline + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+def countLetters(column):
+    """Return Counter of each byte value in column, a bytes object."""
+    counts = Counter()
+    for letter in letters:
+        count = column.count(letter.to_bytes(1, 'big'))
+        if count:
+            counts[letter] = count
+    others = column.translate(None, letters)
+    if others:
+        counts.update(others)
+    return counts
+
+def countChunk(path, start, end):
+    """
+    Return (lengths, positions, distinct) for the words in bytes start to end
+    of the file at path, where lengths counts words by length, positions[i]
+    counts the letters in position i, and distinct is the set of words
+    (upper case, as bytes).
+    """
+    with open(path, 'rb') as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            words = mm[start:end].upper().split()
+
+    lengths = Counter(map(len, words))
+    positions = [Counter() for _ in range(max(lengths, default=0))]
+    if len(lengths) > 1:
+        words.sort(key=len)
+    first = 0
+    for length in sorted(lengths):
+        joined = b''.join(words[first:first + lengths[length]])
+        first += lengths[length]
+        for pos in range(length):
+            positions[pos].update(countLetters(joined[pos::length]))
+    return lengths, positions, set(words)
+
+def mergeCounts(total, lengths, positions, distinct):
+    """Merge the results of one chunk (from countChunk) into total."""
+    total['lengths'].update(lengths)
+    for pos, counts in enumerate(positions):
+        if pos == len(total['positions']):
+            total['positions'].append(Counter())
+        total['positions'][pos].update(counts)
+    total['distinct'] |= distinct
+
+def corpusStats(paths, workers=None, chunkBytes=2**24):
+    """
+    Return dictionary of statistics for the words in all files in paths,
+    using workers processes (os.cpu_count() by default):
+
+        'bytes'     : total size of the files
+        'words'     : total number of words
+        'lengths'   : Counter of word length to number of words
+        'positions' : list whose i-th entry is a Counter mapping each letter
+                      (as a one-character string) to its count in position i
+        'distinct'  : number of distinct words (ignoring case)
+        'seconds'   : elapsed time
+    """
+    begin = time.perf_counter()
+    tasks = [(path, start, end) for path in paths for start, end in chunkRanges(path, chunkBytes)]
+    total = { 'lengths' : Counter(), 'positions' : [], 'distinct' : set() }
+
+    if workers == 1 or len(tasks) < 2:
+        for task in tasks:
+            mergeCounts(total, *countChunk(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(countChunk, *zip(*tasks)):
+                mergeCounts(total, *result)
+
+    return {
+        'bytes'     : sum(os.path.getsize(path) for path in paths),
+        'words'     : sum(total['lengths'].values()),
+        'lengths'   : total['lengths'],
+        'positions' : [Counter({ chr(k) : v for k, v in counts.items() }) for counts in total['positions']],
+        'distinct'  : len(total['distinct']),
+        'seconds'   : time.perf_counter() - begin,
+    }
+
+def outputStats(stats, maxPositions=8):
+    """Print statistics from corpusStats, including throughput in MB/s."""
+    megabytes = stats['bytes'] / 2**20
+    print (f"{stats['words']} words ({stats['distinct']} distinct) in {megabytes:.1f}MB")
+    print (f"{stats['seconds']:f} seconds, {megabytes / max(stats['seconds'], 1e-9):.1f} MB/s")
+    print ()
+    print ('Length\tCount')
+    for length in sorted(stats['lengths']):
+        print (f"{length}\t{stats['lengths'][length]}")
+    print ()
+
+    positions = stats['positions'][:maxPositions]
+    letters = sorted(set(letter for counts in positions for letter in counts))
+    print ('Letter\t' + '\t'.join(str(pos) for pos in range(len(positions))))
+    for letter in letters:
+        print (f'{letter}\t' + '\t'.join(str(counts[letter]) for counts in positions))
+
+class CorpusStatsTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'corpus.txt')
+        with open(self.path, 'w') as fp:
+            fp.write('cold\nCORD card\nto\nwarm\n\ncold\nwarmer')
+
+    def testCountLetters(self):
+        self.assertEqual({ord('A') : 2, ord('B') : 1, ord('-') : 1}, countLetters(b'AB-A'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testChunks(self):
+        ranges = chunkRanges(self.path, 3)
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(os.path.getsize(self.path), ranges[-1][1])
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        for start, end in ranges[:-1]:
+            self.assertEqual(b'\n'[0], data[end - 1])
+
+    def testStats(self):
+        for workers, chunkBytes in [(1, 2**20), (2, 4)]:
+            stats = corpusStats([self.path, self.path], workers, chunkBytes)
+            self.assertEqual(14, stats['words'])
+            self.assertEqual(6, stats['distinct'])
+            self.assertEqual({2 : 2, 4 : 10, 6 : 2}, stats['lengths'])
+            self.assertEqual({'C' : 8, 'W' : 4, 'T' : 2}, stats['positions'][0])
+            self.assertEqual({'R' : 2}, stats['positions'][5])
+
+    def testEmpty(self):
+        open(self.path, 'w').close()
+        self.assertEqual(0, corpusStats([self.path])['words'])
+
+def main():
+    parser = argparse.ArgumentParser(description='Count words by length, letters by position and distinct words.')
+    parser.add_argument('paths', nargs='+', help='word corpus files')
+    parser.add_argument('--workers', type=int, help='worker processes (default is one per CPU)')
+    parser.add_argument('--chunk', type=int, default=2**24, help='bytes per chunk')
+    args = parser.parse_args()
+    outputStats(corpusStats(args.paths, args.workers, args.chunk))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,347 @@
+"""
+    Priority queue of integer keys supporting decrease-key and removal.
+
+    heapq offers no way to change the priority of an entry already in the
+    heap, so a best-first search must push a second entry and skip the
+    stale one when it is eventually popped (lazy deletion). The heap then
+    holds one entry per update rather than one per key.
+
+    IndexedHeap is a d-ary heap (4 children per node by default, which
+    makes the heap shallower than a binary heap) of keys 0 .. capacity-1.
+    The keys, their priorities and the position of each key within the
+    heap are all kept in arrays, so any key can be found in O(1) time and
+    its priority changed, or the key removed, in O(log n) time.
+"""
+import heapq
+import random
+import time
+import tracemalloc
+import unittest
+
+from array import array
+
+class IndexedHeap:
+    """
+    Min-heap of integer keys in 0 .. capacity-1 (the arrays grow if a larger
+    key is pushed), each with a float priority, where d is the number of
+    children of each node.
+    """
+    def __init__(self, capacity=16, d=4):
+        self.d = d
+        self.keys = array('i')
+        self.position = array('i', [-1]) * capacity
+        self.priorities = array('d', [0.0]) * capacity
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return 0 <= key < len(self.position) and self.position[key] >= 0
+
+    def priority(self, key):
+        """Return priority of key, which must be in the heap."""
+        if key not in self:
+            raise KeyError(key)
+        return self.priorities[key]
+
+    def push(self, key, priority):
+        """Add key with priority, or change its priority if already present."""
+        if key < 0:
+            raise ValueError(f'{key} is negative')
+        if key in self:
+            self.update(key, priority)
+            return
+        if key >= len(self.position):
+            grow = max(key + 1, 2 * len(self.position)) - len(self.position)
+            self.position.extend(array('i', [-1]) * grow)
+            self.priorities.extend(array('d', [0.0]) * grow)
+
+        self.priorities[key] = priority
+        self.keys.append(key)
+        self.position[key] = len(self.keys) - 1
+        self.siftUp(len(self.keys) - 1)
+
+    def peek(self):
+        """Return (key, priority) with smallest priority without removing it."""
+        if not self.keys:
+            raise IndexError('peek at an empty IndexedHeap')
+        key = self.keys[0]
+        return key, self.priorities[key]
+
+    def pop(self):
+        """Remove and return (key, priority) with smallest priority."""
+        if not self.keys:
+            raise IndexError('pop from an empty IndexedHeap')
+        key = self.keys[0]
+        self.removeAt(0)
+        return key, self.priorities[key]
+
+    def decreaseKey(self, key, priority):
+        """Lower the priority of key, which must be in the heap."""
+        if key not in self:
+            raise KeyError(key)
+        if priority > self.priorities[key]:
+            raise ValueError(f'{priority} is larger than current priority {self.priorities[key]}')
+        self.priorities[key] = priority
+        self.siftUp(self.position[key])
+
+    def update(self, key, priority):
+        """Change the priority of key, which must be in the heap, in either direction."""
+        if key not in self:
+            raise KeyError(key)
+        old = self.priorities[key]
+        self.priorities[key] = priority
+        if priority < old:
+            self.siftUp(self.position[key])
+        else:
+            self.siftDown(self.position[key])
+
+    def remove(self, key):
+        """Remove key, which must be in the heap, and return its priority."""
+        if key not in self:
+            raise KeyError(key)
+        self.removeAt(self.position[key])
+        return self.priorities[key]
+
+    def removeAt(self, idx):
+        """Remove the key at heap index idx, moving the last key into its place."""
+        key = self.keys[idx]
+        last = self.keys.pop()
+        self.position[key] = -1
+        if idx < len(self.keys):
+            self.keys[idx] = last
+            self.position[last] = idx
+            self.siftDown(idx)
+            self.siftUp(self.position[last])
+
+    def siftUp(self, idx):
+        """Move key at heap index idx up until its parent has no larger priority."""
+        keys, position, priorities, d = self.keys, self.position, self.priorities, self.d
+        key = keys[idx]
+        priority = priorities[key]
+        while idx > 0:
+            parent = (idx - 1) // d
+            parentKey = keys[parent]
+            if priorities[parentKey] <= priority:
+                break
+            keys[idx] = parentKey
+            position[parentKey] = idx
+            idx = parent
+        keys[idx] = key
+        position[key] = idx
+
+    def siftDown(self, idx):
+        """Move key at heap index idx down until no child has a smaller priority."""
+        keys, position, priorities, d = self.keys, self.position, self.priorities, self.d
+        n = len(keys)
+        key = keys[idx]
+        priority = priorities[key]
+        while True:
+            first = d * idx + 1
+            if first >= n:
+                break
+            best = first
+            bestPriority = priorities[keys[first]]
+            for child in range(first + 1, min(first + d, n)):
+                if priorities[keys[child]] < bestPriority:
+                    best = child
+                    bestPriority = priorities[keys[child]]
+            if bestPriority >= priority:
+                break
+            keys[idx] = keys[best]
+            position[keys[best]] = idx
+            idx = best
+        keys[idx] = key
+        position[key] = idx
+
+class LazyHeap:
+    """
+    Priority queue with the same methods as IndexedHeap using heapq, where
+    changing a priority pushes a new entry and removal only forgets the key;
+    outdated entries are discarded when they reach the top.
+    """
+    def __init__(self):
+        self.heap = []
+        self.current = {}
+
+    def __len__(self):
+        return len(self.current)
+
+    def push(self, key, priority):
+        """Add key with priority, or change its priority if already present."""
+        self.current[key] = priority
+        heapq.heappush(self.heap, (priority, key))
+
+    decreaseKey = push
+    update = push
+
+    def remove(self, key):
+        """Remove key and return its priority."""
+        return self.current.pop(key)
+
+    def pop(self):
+        """Remove and return (key, priority) with smallest priority."""
+        while self.heap:
+            priority, key = heapq.heappop(self.heap)
+            if self.current.get(key) == priority:
+                del self.current[key]
+                return key, priority
+        raise IndexError('pop from an empty LazyHeap')
+
+class IndexedHeapTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def testOrder(self):
+        for d in [2, 3, 4, 8]:
+            ih = IndexedHeap(4, d)
+            values = [random.random() for _ in range(200)]
+            for key, priority in enumerate(values):
+                ih.push(key, priority)
+            self.assertEqual(200, len(ih))
+            self.assertEqual(min(values), ih.peek()[1])
+            self.assertEqual(sorted(values), [ih.pop()[1] for _ in range(200)])
+            with self.assertRaises(IndexError):
+                ih.pop()
+
+    def testDecreaseAndRemove(self):
+        ih = IndexedHeap()
+        for key in range(100):
+            ih.push(key, 100 + key)
+        ih.decreaseKey(50, 1)
+        ih.update(0, 500)
+        ih.push(99, 2)
+        self.assertEqual(101, ih.remove(1))
+        self.assertFalse(1 in ih)
+        with self.assertRaises(KeyError):
+            ih.remove(1)
+        with self.assertRaises(ValueError):
+            ih.decreaseKey(50, 10)
+
+        small = IndexedHeap(4)
+        with self.assertRaises(ValueError):
+            small.push(-1, 0.5)
+        self.assertFalse(3 in small)
+        self.assertEqual(0, len(small))
+
+        popped = [ih.pop()[0] for _ in range(len(ih))]
+        self.assertEqual([50, 99, 2, 3], popped[:4])
+        self.assertEqual(0, popped[-1])
+        self.assertEqual(99, len(popped))
+
+    def testMatchesLazyHeap(self):
+        ih = IndexedHeap()
+        lazy = LazyHeap()
+        for op, key, priority in mixedOperations(2000, 100):
+            if op == 'pop':
+                self.assertEqual(lazy.pop()[1], ih.pop()[1])
+            elif op == 'remove':
+                self.assertEqual(lazy.remove(key), ih.remove(key))
+            else:
+                lazy.push(key, priority)
+                ih.push(key, priority)
+        self.assertEqual(len(lazy), len(ih))
+
+def mixedOperations(num, numKeys, decreases=2, pops=1, removes=0, seed=0):
+    """
+    Return list of num (operation, key, priority) tuples on keys 0 .. numKeys-1,
+    where operation is 'push' (for a key not present), 'decrease' (to a lower
+    priority for a key present), 'pop' or 'remove' (of a key present). The
+    weights of decrease, pop and remove are relative to one push.
+    """
+    rng = random.Random(seed)
+    simulated = LazyHeap()
+    present = []
+    slot = {}
+    absent = list(range(numKeys))
+    rng.shuffle(absent)
+
+    def forget(key):
+        last = present.pop()
+        if last != key:
+            present[slot[key]] = last
+            slot[last] = slot[key]
+        del slot[key]
+        absent.append(key)
+
+    ops = []
+    total = 1 + decreases + pops + removes
+    while len(ops) < num:
+        r = rng.random() * total
+        if not present or (r < 1 and absent):
+            key = absent.pop()
+            slot[key] = len(present)
+            present.append(key)
+            simulated.push(key, rng.random())
+            ops.append(('push', key, simulated.current[key]))
+        elif r < 1:
+            continue
+        elif r < 1 + decreases:
+            key = present[rng.randrange(len(present))]
+            simulated.push(key, simulated.current[key] * rng.random())
+            ops.append(('decrease', key, simulated.current[key]))
+        elif r < 1 + decreases + pops:
+            key, _ = simulated.pop()
+            forget(key)
+            ops.append(('pop', None, None))
+        else:
+            key = present[rng.randrange(len(present))]
+            simulated.remove(key)
+            forget(key)
+            ops.append(('remove', key, None))
+    return ops
+
+def runOperations(pq, ops):
+    """Perform ops (from mixedOperations) on priority queue pq."""
+    for op, key, priority in ops:
+        if op == 'push':
+            pq.push(key, priority)
+        elif op == 'decrease':
+            pq.decreaseKey(key, priority)
+        elif op == 'pop':
+            pq.pop()
+        else:
+            pq.remove(key)
+
+def outputTiming():
+    """
+    Generate timing report comparing IndexedHeap (binary and 4-ary) against
+    heapq with lazy deletion for mixes of push, decrease-key, pop and remove
+    over N keys, along with peak memory (as reported by tracemalloc).
+    """
+    mixes = [('Push/Pop', 0, 1, 0), ('Decrease', 4, 1, 0), ('Remove', 2, 1, 1)]
+    builders = [('Binary', lambda n: IndexedHeap(n, 2)), ('4-ary', lambda n: IndexedHeap(n, 4)),
+                ('Lazy', lambda n: LazyHeap())]
+    print ('Mix\t\tN\t' + '\t\t'.join(name for name, _ in builders) + '\t\t' +
+           '\t'.join(name + ' Bytes' for name, _ in builders))
+    for mix, decreases, pops, removes in mixes:
+        for n in [2**10, 2**14]:
+            ops = mixedOperations(10 * n, n, decreases, pops, removes)
+            times = []
+            peaks = []
+            for _, build in builders:
+                pq = build(n)
+                start = time.perf_counter()
+                runOperations(pq, ops)
+                times.append(time.perf_counter() - start)
+
+                tracemalloc.start()
+                runOperations(build(n), ops)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            print (f'{mix:<10}\t{n}\t' + '\t'.join(f'{t:f}' for t in times) + '\t' +
+                   '\t'.join(str(p) for p in peaks))
+
+def registerBenchmarks(harness):
+    """
+    Register the decrease-key mix (from outputTiming) for IndexedHeap and
+    LazyHeap with benchmark.py harness, starting from an empty heap each time.
+    """
+    for name, build in [('Binary', lambda n: IndexedHeap(n, 2)), ('4-ary', lambda n: IndexedHeap(n, 4)),
+                        ('Lazy', lambda n: LazyHeap())]:
+        harness.register('priorityQueue', name, lambda build, n, ops: runOperations(build(n), ops),
+                         lambda n, build=build: (build, n, mixedOperations(10 * n, n, 4, 1, 0)), [2**10, 2**14])
+
+if __name__ == '__main__':
+    outputTiming()
+    unittest.main()
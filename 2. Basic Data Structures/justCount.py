@@ -3,17 +3,16 @@ Just count the number of 4-letter words in the english dictionary.
 
 Note: This dictionary only has 4-letter words, but you can replace
 it with any dictionary you have and the resulting code will still work.
+The words are loaded using wordLoader, which caches them after the first
+run.
+
+To count words of every length (and letters by position) in large
+corpora, see corpusStats.py.
 """
 
-ct = 0
+from wordLoader import loadWords
 
 wordList = "words.english.txt"
-with open(wordList) as fp:
-    line = fp.readline()
-    while line:
-        word = line[:-1].upper()
-        if len(word) == 4:
-            ct = ct+1
-        line = fp.readline()
-        
+ct = len(loadWords(wordList, 4))
+
 print (ct)
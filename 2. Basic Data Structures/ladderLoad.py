@@ -0,0 +1,69 @@
+"""
+    Load generator for LadderService.
+
+    Sends a number of word ladder queries to a LadderService, keeping a
+    fixed number of them in flight at once, and reports the p50 and p99
+    latency along with the cache counters. Queries are drawn from a small
+    pool of random word pairs (in either direction), so repeated and
+    reversed queries exercise the cache and request coalescing.
+
+    $ python3 ladderLoad.py --requests 2000 --concurrency 32 --pairs 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from ladderService import LadderService
+from queueWordLadder import randomPairs
+
+# Use the same percentile as the benchmark harness at the top of the repository
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmark import percentile
+
+async def generateLoad(service, queries, concurrency):
+    """
+    Send every (start, end) in queries to service, at most concurrency at
+    a time, and return list of latencies in seconds.
+    """
+    latencies = []
+    pending = iter(queries)
+
+    async def client():
+        for start, end in pending:
+            begin = time.perf_counter()
+            await service.ladder(start, end)
+            latencies.append(time.perf_counter() - begin)
+
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate load against LadderService.')
+    parser.add_argument('--requests', type=int, default=2000, help='number of queries to send')
+    parser.add_argument('--concurrency', type=int, default=32, help='queries in flight at once')
+    parser.add_argument('--pairs', type=int, default=200, help='number of distinct word pairs')
+    parser.add_argument('--cache', type=int, default=1024, help='number of cached answers')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    args = parser.parse_args()
+
+    service = LadderService(cacheSize=args.cache)
+    pairs = randomPairs(service.words, args.pairs, args.seed)
+    rng = random.Random(args.seed)
+    queries = []
+    for _ in range(args.requests):
+        start, end = rng.choice(pairs)
+        queries.append((start, end) if rng.random() < 0.5 else (end, start))
+
+    begin = time.perf_counter()
+    latencies = asyncio.run(generateLoad(service, queries, args.concurrency))
+    elapsed = time.perf_counter() - begin
+
+    print (f'{len(latencies)} queries in {elapsed:f} seconds ({len(latencies) / elapsed:.0f}/sec)')
+    print (f'p50 {1000 * percentile(latencies, 50):.3f}ms\tp99 {1000 * percentile(latencies, 99):.3f}ms')
+    print (service.counters())
+
+if __name__ == '__main__':
+    main()
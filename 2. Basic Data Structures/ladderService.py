@@ -0,0 +1,184 @@
+"""
+    Answer word ladder queries concurrently using asyncio.
+
+    LadderService loads the dictionary (and its pattern index) once. Each
+    search runs in an executor so the event loop stays responsive while it
+    runs. Answers are kept in an LRU cache; since a ladder from end to start
+    is just the reverse of a ladder from start to end, a cached answer
+    serves both directions. Identical queries that arrive while a search
+    is still running share its result instead of starting another search.
+
+    See ladderLoad.py for a load generator that reports latency.
+"""
+import asyncio
+import unittest
+
+from collections import OrderedDict
+
+from queueWordLadder import wordFile, loadWordsAsDictionary, buildPatternIndex, exploreBidirectional
+
+def copyLadder(ladder, reverse=False):
+    """
+    Return a new list of the words in ladder (reversed if requested), or None
+    if ladder is None, so callers can never alter a cached answer.
+    """
+    if ladder is None:
+        return None
+    return list(reversed(ladder)) if reverse else list(ladder)
+
+class LadderService:
+    """
+    Word ladder query service. cacheSize is the number of answers kept,
+    executor is passed to run_in_executor (None for the default thread
+    pool) and explore is the search used for answers that are not cached.
+    """
+    def __init__(self, wordList=wordFile, length=4, cacheSize=1024, executor=None,
+                 explore=exploreBidirectional):
+        self.words = loadWordsAsDictionary(wordList, length)
+        self.patterns = buildPatternIndex(self.words)
+        self.cacheSize = cacheSize
+        self.executor = executor
+        self.explore = explore
+        self.cache = OrderedDict()
+        self.inFlight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def counters(self):
+        """Return dictionary of cache hits, misses and coalesced queries."""
+        return { 'hits' : self.hits, 'misses' : self.misses,
+                 'coalesced' : self.coalesced, 'cached' : len(self.cache) }
+
+    def search(self, start, end):
+        """Return ladder from start to end as tuple of words, or None if none exists."""
+        ladder = self.explore(self.words, start, end, patterns=self.patterns)
+        return tuple(ladder.collectTrail()) if ladder else None
+
+    def lookup(self, start, end):
+        """
+        Return (True, ladder) if the answer for start to end (or end to start,
+        reversed) is cached, marking it most recently used; else (False, None).
+        The ladder returned is a new list.
+        """
+        if (start, end) in self.cache:
+            self.cache.move_to_end((start, end))
+            return True, copyLadder(self.cache[(start, end)])
+        if (end, start) in self.cache:
+            self.cache.move_to_end((end, start))
+            return True, copyLadder(self.cache[(end, start)], reverse=True)
+        return False, None
+
+    def remember(self, start, end, ladder):
+        """
+        Cache ladder (a tuple, so it cannot be altered) for start to end,
+        discarding least recently used answers.
+        """
+        self.cache[(start, end)] = ladder
+        self.cache.move_to_end((start, end))
+        while len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+
+    async def ladder(self, start, end):
+        """
+        Return ladder from start to end as list of words, or None if none
+        exists. Raises Exception if either is not a valid word.
+        """
+        start = start.upper()
+        end = end.upper()
+        if start not in self.words:
+            raise Exception (start + " is not a valid word.")
+        if end not in self.words:
+            raise Exception (end + " is not a valid word.")
+
+        found, ladder = self.lookup(start, end)
+        if found:
+            self.hits += 1
+            return ladder
+
+        for key, reverse in [((start, end), False), ((end, start), True)]:
+            if key in self.inFlight:
+                self.coalesced += 1
+                ladder = await asyncio.shield(self.inFlight[key])
+                return copyLadder(ladder, reverse)
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self.search, start, end)
+        self.inFlight[(start, end)] = future
+        try:
+            ladder = await asyncio.shield(future)
+        finally:
+            del self.inFlight[(start, end)]
+        self.remember(start, end, ladder)
+        return copyLadder(ladder)
+
+class LadderServiceTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.service = LadderService(cacheSize=2)
+
+    def setUp(self):
+        self.service.cache.clear()
+        self.service.hits = self.service.misses = self.service.coalesced = 0
+
+    def testCacheAndReverse(self):
+        async def queries():
+            first = await self.service.ladder('COLD', 'WARM')
+            again = await self.service.ladder('cold', 'warm')
+            reverse = await self.service.ladder('WARM', 'COLD')
+            return first, again, reverse
+        first, again, reverse = asyncio.run(queries())
+        self.assertEqual(5, len(first))
+        self.assertEqual(first, again)
+        self.assertEqual(first[::-1], reverse)
+        self.assertEqual(1, self.service.misses)
+        self.assertEqual(2, self.service.hits)
+
+    def testCoalesce(self):
+        async def queries():
+            return await asyncio.gather(self.service.ladder('COLD', 'WARM'),
+                                        self.service.ladder('COLD', 'WARM'),
+                                        self.service.ladder('WARM', 'COLD'))
+        ladders = asyncio.run(queries())
+        self.assertEqual(ladders[0], ladders[1])
+        self.assertEqual(ladders[0][::-1], ladders[2])
+        self.assertEqual(1, self.service.misses)
+        self.assertEqual(2, self.service.coalesced)
+
+    def testCopies(self):
+        async def queries():
+            first = await self.service.ladder('COLD', 'WARM')
+            first.clear()
+            again = await self.service.ladder('COLD', 'WARM')
+            again.append('XXXX')
+            return again, await self.service.ladder('WARM', 'COLD')
+        again, reverse = asyncio.run(queries())
+        self.assertEqual(6, len(again))
+        self.assertEqual(5, len(reverse))
+        self.assertEqual('WARM', reverse[0])
+
+        async def coalesced():
+            return await asyncio.gather(self.service.ladder('GOOD', 'BADE'),
+                                        self.service.ladder('GOOD', 'BADE'))
+        first, second = asyncio.run(coalesced())
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+
+    def testEvict(self):
+        async def queries():
+            for start, end in [('COLD', 'WARM'), ('GOOD', 'EVIL'), ('ABRI', 'ISMS')]:
+                await self.service.ladder(start, end)
+        asyncio.run(queries())
+        self.assertEqual([('GOOD', 'EVIL'), ('ABRI', 'ISMS')], list(self.service.cache))
+        self.assertIsNone(self.service.cache[('GOOD', 'EVIL')])
+
+    def testInvalid(self):
+        with self.assertRaises(Exception):
+            asyncio.run(self.service.ladder('COLD', 'XXXX'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,7 @@
     word by changing one letter at a time (while forming only real words)
     until the goal is reached.
 
-    Use queue for storage with three different implementations.
+    Use queue for storage with four different implementations.
 
     Timing code passes in function to use for checking whether a word exists.
     This code is used to experiment with variety of options and shows
@@ -13,9 +13,18 @@
 """
 import unittest
 import sys
+import time
 import timeit
+import tracemalloc
 
+from array import array
+from collections import deque
 from datetime import datetime
+from queue import Queue
+
+from queueWordLadder import buildIdIndex, buildPatternIndex, patternNeighbors
+from ringBuffer import RingBuffer
+from wordLoader import loadWords
 
 # Contains words, all in lower case.
 wordFile = "words.english.txt"
@@ -32,8 +41,9 @@ class Stage:
         trail = []
         node = self
         while node:
-            trail.insert(0, node.word)
+            trail.append(node.word)
             node = node.prior
+        trail.reverse()
         return trail
 
 def isWordInDictionary(d, word):
@@ -58,56 +68,169 @@ def isWordInSortedList(aList, tgt):
             return True
     return False
 
-def loadWordsAsDictionary(wordList=wordFile):
-    """
-    Return Dictionary of four-letter words to explore, each with
-    a count of zero.
-    """
-    words = {}
-    with open(wordList) as fp:
-       line = fp.readline()
-       
-       while line:
-           word = line[:-1].upper()
-           if len(word) == 4:
-               words[word] = 0
-               
-           line = fp.readline()
-    return words
-
-def loadWordsAsList(wordList=wordFile):
-    """
-    Return list of four-letter words to explore.
-    """
-    words = []
-    with open(wordList) as fp:
-       line = fp.readline()
-       
-       while line:
-           word = line[:-1].upper()
-           if len(word) == 4:
-               words.append(word)
-               
-           line = fp.readline()
-    return words
+def popcount(x):
+    """Return number of bits set in x (int.bit_count needs Python 3.10)."""
+    return bin(x).count('1')
+
+class ArrayTrie:
+    """
+    Trie of upper case words stored in two arrays and a bytearray, with no
+    object per node. Nodes are numbered in breadth-first order so that the
+    children of a node are numbered consecutively, in alphabetical order.
+    For node n, bit i of masks[n] is set if n has a child for the i-th
+    letter, firstChild[n] is the number of its first child (so the child for
+    letter i is firstChild[n] plus the number of bits in masks[n] below bit
+    i), and terminal[n] is 1 if a word ends at n. Node 0 is the root.
+    Words containing anything other than the letters A to Z (such as "AL'S")
+    cannot be stored and are skipped.
+    """
+    def __init__(self, words):
+        root = {}
+        self.count = 0
+        for word in sorted(set(words)):
+            if not all('A' <= letter <= 'Z' for letter in word):
+                continue
+            node = root
+            for letter in word:
+                node = node.setdefault(ord(letter) - 65, {})
+            node[None] = True
+            self.count += 1
+
+        self.masks = array('I')
+        self.firstChild = array('i')
+        self.terminal = bytearray()
+        level = [root]
+        nextNode = 1
+        while level:
+            children = []
+            for node in level:
+                mask = 0
+                for letter in sorted(k for k in node if k is not None):
+                    mask |= 1 << letter
+                    children.append(node[letter])
+                self.masks.append(mask)
+                self.firstChild.append(nextNode)
+                self.terminal.append(1 if None in node else 0)
+                nextNode += popcount(mask)
+            level = children
+
+    def __len__(self):
+        return self.count
+
+    def child(self, node, letter):
+        """Return child of node for letter (0 for 'A'), or -1 if there is none."""
+        mask = self.masks[node]
+        bit = 1 << letter
+        if not mask & bit:
+            return -1
+        return self.firstChild[node] + popcount(mask & (bit - 1))
+
+    def walk(self, node, word):
+        """Return node reached from node by following the letters of word, or -1."""
+        masks = self.masks
+        firstChild = self.firstChild
+        for letter in word:
+            bit = 1 << (ord(letter) - 65) if 'A' <= letter <= 'Z' else 0
+            mask = masks[node]
+            if not mask & bit:
+                return -1
+            node = firstChild[node] + popcount(mask & (bit - 1))
+        return node
+
+    def __contains__(self, word):
+        node = self.walk(0, word)
+        return node >= 0 and self.terminal[node] == 1
+
+    def __iter__(self):
+        stack = [(0, '')]
+        while stack:
+            node, prefix = stack.pop()
+            if self.terminal[node]:
+                yield prefix
+            mask = self.masks[node]
+            first = self.firstChild[node]
+            children = []
+            for letter in range(26):
+                if mask & (1 << letter):
+                    children.append((first + len(children), prefix + chr(65 + letter)))
+            stack.extend(reversed(children))
+
+    def neighbors(self, word):
+        """
+        Return words that differ from word in one position. The prefix of
+        word is walked once; at each position only letters that continue the
+        prefix are tried, and a candidate string is built only once the rest
+        of word is found to follow that letter to the end of a word.
+        """
+        neighbors = []
+        node = 0
+        for pos, letter in enumerate(word):
+            current = ord(letter) - 65
+            suffix = word[pos+1:]
+            mask = self.masks[node]
+            child = self.firstChild[node]
+            while mask:
+                low = mask & -mask
+                other = low.bit_length() - 1
+                if other != current:
+                    end = self.walk(child, suffix)
+                    if end >= 0 and self.terminal[end]:
+                        neighbors.append(word[:pos] + chr(65 + other) + suffix)
+                mask ^= low
+                child += 1
+            node = self.child(node, current) if 0 <= current < 26 else -1
+            if node < 0:
+                break
+        return neighbors
+
+def isWordInTrie(trie, word):
+    """Determine if word is valid using ArrayTrie."""
+    return word in trie
+
+def loadWordsAsTrie(wordList=wordFile, length=4):
+    """
+    Return ArrayTrie of words of given length (four by default) to explore.
+    """
+    return ArrayTrie(loadWords(wordList, length))
+
+def loadWordsAsDictionary(wordList=wordFile, length=4):
+    """
+    Return Dictionary of words of given length (four by default) to explore,
+    each with a count of zero.
+    """
+    return dict.fromkeys(loadWords(wordList, length), 0)
+
+def loadWordsAsList(wordList=wordFile, length=4):
+    """
+    Return list of words of given length (four by default) to explore.
+    """
+    return loadWords(wordList, length)
 
 def neighbors(word, words, isWord):
-    """Return valid neighboring 4-letter words of given word."""
+    """
+    Return valid neighboring words (of the same length) of given word. An
+    ArrayTrie generates its own neighbors, pruning by prefix.
+    """
+    if isinstance(words, ArrayTrie):
+        return words.neighbors(word)
     neighbors = []
     for let in alphabet:
-        for pos in range(0,4):
+        for pos in range(len(word)):
             newWord = word[0:pos] + let + word[pos+1:]
             if isWord(words, newWord) and newWord != word:
                 neighbors.append(newWord)
                 
     return neighbors
 
-def exploreQueueList(words, start, end, isWord):
-    """Using existing collection of words, find ladder from start to end"""
+def exploreQueueList(words, start, end, isWord, patterns=None):
+    """
+    Using existing collection of words, find ladder from start to end. Use pattern index
+    to find neighbors, if provided, instead of isWord.
+    """
     if not start in words:
-        raise Exception (start + " is not a valid four-letter word.")
+        raise Exception (start + " is not a valid word.")
     if not end in words:
-        raise Exception (end + " is not a valid four-letter word.")
+        raise Exception (end + " is not a valid word.")
 
     active = []
     active.append(Stage(start))
@@ -115,7 +238,11 @@ def exploreQueueList(words, start, end, isWord):
     while active:
         st = active.pop(0)
             
-        for nxt in neighbors(st.word, words, isWord):
+        if patterns is None:
+            candidates = neighbors(st.word, words, isWord)
+        else:
+            candidates = patternNeighbors(st.word, patterns)
+        for nxt in candidates:
             link = Stage(nxt, st)
             if nxt == end:
                 return link
@@ -125,21 +252,27 @@ def exploreQueueList(words, start, end, isWord):
     return []
 
 
-def exploreQueueQueue(words, start, end, isWord):
-    """Using existing collection of words, find ladder from start to end."""
+def exploreQueueQueue(words, start, end, isWord, patterns=None):
+    """
+    Using existing collection of words, find ladder from start to end. Use pattern index
+    to find neighbors, if provided, instead of isWord.
+    """
     if not start in words:
-        raise Exception (start + " is not a valid four-letter word.")
+        raise Exception (start + " is not a valid word.")
     if not end in words:
-        raise Exception (end + " is not a valid four-letter word.")
+        raise Exception (end + " is not a valid word.")
 
-    from queue import Queue
     active = Queue()
     active.put(Stage(start))
     
     while active:
         st = active.get()
             
-        for nxt in neighbors(st.word, words, isWord):
+        if patterns is None:
+            candidates = neighbors(st.word, words, isWord)
+        else:
+            candidates = patternNeighbors(st.word, patterns)
+        for nxt in candidates:
             link = Stage(nxt, st)
             if nxt == end:
                 return link
@@ -148,21 +281,27 @@ def exploreQueueQueue(words, start, end, isWord):
     # No chain
     return []
 
-def exploreQueueDQ(words, start, end, isWord):
-    """Using existing collection of words, find ladder from start to end."""
+def exploreQueueDQ(words, start, end, isWord, patterns=None):
+    """
+    Using existing collection of words, find ladder from start to end. Use pattern index
+    to find neighbors, if provided, instead of isWord.
+    """
     if not start in words:
-        raise Exception (start + " is not a valid four-letter word.")
+        raise Exception (start + " is not a valid word.")
     if not end in words:
-        raise Exception (end + " is not a valid four-letter word.")
+        raise Exception (end + " is not a valid word.")
 
-    from collections import deque
     active = deque()
     active.append(Stage(start))
     
     while active:
         st = active.popleft()
             
-        for nxt in neighbors(st.word, words, isWord):
+        if patterns is None:
+            candidates = neighbors(st.word, words, isWord)
+        else:
+            candidates = patternNeighbors(st.word, patterns)
+        for nxt in candidates:
             link = Stage(nxt, st)
             if nxt == end:
                 return link
@@ -171,29 +310,196 @@ def exploreQueueDQ(words, start, end, isWord):
     # No chain
     return []
 
+def exploreQueueRing(words, start, end, isWord, patterns=None, index=None):
+    """
+    Using existing collection of words, find ladder from start to end. Use pattern index
+    to find neighbors, if provided, instead of isWord. Rather than creating a Stage for
+    each word added to the queue, record its word id (from buildIdIndex, built if index
+    is not provided) and the position of its prior in two arrays, so the RingBuffer only
+    holds ints. Stage objects are created for the ladder that is returned.
+    """
+    if not start in words:
+        raise Exception (start + " is not a valid word.")
+    if not end in words:
+        raise Exception (end + " is not a valid word.")
+
+    wordList, ids = index if index else buildIdIndex(words)
+    stageWord = array('i', [ids[start]])
+    stagePrior = array('i', [-1])
+    active = RingBuffer()
+    active.append(0)
+
+    while active:
+        st = active.popleft()
+
+        if patterns is None:
+            candidates = neighbors(wordList[stageWord[st]], words, isWord)
+        else:
+            candidates = patternNeighbors(wordList[stageWord[st]], patterns)
+        for nxt in candidates:
+            stageWord.append(ids[nxt])
+            stagePrior.append(st)
+            if nxt == end:
+                path = []
+                link = len(stageWord) - 1
+                while link >= 0:
+                    path.append(wordList[stageWord[link]])
+                    link = stagePrior[link]
+                ladder = None
+                for word in reversed(path):
+                    ladder = Stage(word, ladder)
+                return ladder
+            active.append(len(stageWord) - 1)
+
+    # No chain
+    return []
+
+def outputQueueTiming(n=100000):
+    """
+    Generate report of throughput (append and pop pairs per second) and
+    memory (bytes per element, measured by tracemalloc) of each queue. Each
+    queue is first filled with n distinct ints; then n times, one value is
+    removed from the front and one added to the end.
+    """
+    queues = [
+        ('List',  list,       lambda q: q.pop(0),   lambda q, v: q.append(v)),
+        ('Q',     Queue,      lambda q: q.get(),    lambda q, v: q.put(v)),
+        ('DQ',    deque,      lambda q: q.popleft(), lambda q, v: q.append(v)),
+        ('Ring',  RingBuffer, lambda q: q.popleft(), lambda q, v: q.append(v)),
+    ]
+    print ('Queue\tOps/sec\t\tBytes/element')
+    for name, build, pop, push in queues:
+        tracemalloc.start()
+        queue = build()
+        for v in range(n, 2*n):
+            push(queue, v)
+        perElement = tracemalloc.get_traced_memory()[0] / n
+        tracemalloc.stop()
+
+        begin = time.perf_counter()
+        for v in range(2*n, 3*n):
+            pop(queue)
+            push(queue, v)
+        rate = n / (time.perf_counter() - begin)
+        print (f'{name}\t{rate:.0f}\t\t{perElement:.1f}')
+
+def outputTrieTiming():
+    """
+    Generate report comparing the Dictionary and ArrayTrie backends: memory
+    retained by each (measured by tracemalloc) and time to find the
+    neighbors of every word, with neighbors() for the dictionary and the
+    prefix-pruned ArrayTrie.neighbors() for the trie.
+    """
+    print ('Backend\t\tBytes\t\tNeighbors')
+    for name, load, valid in [('Dictionary', loadWordsAsDictionary, isWordInDictionary),
+                              ('Trie', loadWordsAsTrie, isWordInTrie)]:
+        wordList = loadWords(wordFile)
+        tracemalloc.start()
+        words = load()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        elapsed = timeit.timeit(lambda: [neighbors(word, words, valid) for word in wordList], number=1)
+        print (f'{name:<10}\t{size}\t\t{elapsed:f}')
+
 def outputTiming(start, end, num):
     """
-    Generate timing report for the three different approaches.
+    Generate timing report for the four different approaches.
     """
-    print ('Queue\tList\tBASearch\tDictionary')
+    print ('Queue\tList\tBASearch\tDictionary\tPattern\tTrie')
 
-    trials = ['L', 'SL', 'D']
-    loadMethods = ['loadWordsAsList', 'loadWordsAsList', 'loadWordsAsDictionary']
-    valids = ['isWordInList', 'isWordInSortedList', 'isWordInDictionary' ]
+    trials = ['L', 'SL', 'D', 'P', 'T']
+    loadMethods = ['loadWordsAsList', 'loadWordsAsList', 'loadWordsAsDictionary', 'loadWordsAsDictionary', 'loadWordsAsTrie']
+    valids = ['isWordInList', 'isWordInSortedList', 'isWordInDictionary', 'isWordInDictionary', 'isWordInTrie' ]
+    patterns = [None, None, None, 'buildPatternIndex(words)', None]
     countsDQ = {}
     countsList = {}
     countsQueue = {}
-    for trial,load,valid in zip(trials,loadMethods,valids):
-        countsDQ[trial] = timeit.timeit(stmt=f'exploreQueueDQ(words,"{start}","{end}",{valid})', number=num,
-                setup=f'from __main__ import {valid},{load},exploreQueueDQ,wordFile\nwords={load}(wordFile)')
-        countsList[trial] = timeit.timeit(stmt=f'exploreQueueList(words,"{start}","{end}",{valid})', number=num,
-                setup=f'from __main__ import {valid},{load},exploreQueueList,wordFile\nwords={load}(wordFile)')
-        countsQueue[trial] = timeit.timeit(stmt=f'exploreQueueQueue(words,"{start}","{end}",{valid})', number=num,
-                setup=f'from __main__ import {valid},{load},exploreQueueQueue,wordFile\nwords={load}(wordFile)')
+    countsRing = {}
+    for trial,load,valid,pattern in zip(trials,loadMethods,valids,patterns):
+        countsDQ[trial] = timeit.timeit(stmt=f'exploreQueueDQ(words,"{start}","{end}",{valid},patterns)', number=num,
+                setup=f'words={load}(wordFile)\npatterns={pattern}', globals=globals())
+        countsList[trial] = timeit.timeit(stmt=f'exploreQueueList(words,"{start}","{end}",{valid},patterns)', number=num,
+                setup=f'words={load}(wordFile)\npatterns={pattern}', globals=globals())
+        countsQueue[trial] = timeit.timeit(stmt=f'exploreQueueQueue(words,"{start}","{end}",{valid},patterns)', number=num,
+                setup=f'words={load}(wordFile)\npatterns={pattern}', globals=globals())
+        countsRing[trial] = timeit.timeit(stmt=f'exploreQueueRing(words,"{start}","{end}",{valid},patterns,index)', number=num,
+                setup=f'words={load}(wordFile)\npatterns={pattern}\nindex=buildIdIndex(words)', globals=globals())
 
     print ("DQ\t" + '\t'.join(f'{countsDQ[trial]:f}' for trial in trials))
     print ("List\t" + '\t'.join(f'{countsList[trial]:f}' for trial in trials))
     print ("Q\t" + '\t'.join(f'{countsQueue[trial]:f}' for trial in trials))
+    print ("Ring\t" + '\t'.join(f'{countsRing[trial]:f}' for trial in trials))
+    print ()
+    outputQueueTiming()
+    print ()
+    outputTrieTiming()
+
+def registerBenchmarks(harness):
+    """
+    Register COLD to WARM word ladder for each queue implementation with
+    benchmark.py harness, using the Dictionary approach to check words, then
+    the pattern index, and then the ArrayTrie. The word ids used by
+    exploreQueueRing are built in setup, so they are not part of the timing.
+    """
+    def ladderSetup(load, valid, usePatterns):
+        def setup(n):
+            words = load(wordFile)
+            return (words, 'COLD', 'WARM', valid, buildPatternIndex(words) if usePatterns else None,
+                    buildIdIndex(words))
+        return setup
+
+    for suffix, load, valid, usePatterns in [('', loadWordsAsDictionary, isWordInDictionary, False),
+                                             ('Pattern', loadWordsAsDictionary, isWordInDictionary, True),
+                                             ('Trie', loadWordsAsTrie, isWordInTrie, False)]:
+        setup = ladderSetup(load, valid, usePatterns)
+        for meth in [exploreQueueDQ, exploreQueueList, exploreQueueQueue]:
+            harness.register('queueLadder', meth.__name__ + suffix,
+                             lambda words, start, end, valid, patterns, index, meth=meth:
+                                 meth(words, start, end, valid, patterns), setup)
+        harness.register('queueLadder', 'exploreQueueRing' + suffix, exploreQueueRing, setup)
+
+class QueueTimingThreeWordLadderTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.words = loadWordsAsDictionary(wordFile)
+        cls.patterns = buildPatternIndex(cls.words)
+
+    def testRing(self):
+        index = buildIdIndex(self.words)
+        for start, end in [('COLD', 'WARM'), ('LOVE', 'HATE')]:
+            expected = exploreQueueDQ(self.words, start, end, isWordInDictionary).collectTrail()
+            self.assertEqual(expected, exploreQueueRing(self.words, start, end, isWordInDictionary).collectTrail())
+            expected = exploreQueueDQ(self.words, start, end, isWordInDictionary, self.patterns).collectTrail()
+            self.assertEqual(expected, exploreQueueRing(self.words, start, end, isWordInDictionary,
+                                                        self.patterns, index).collectTrail())
+
+    def testTrie(self):
+        trie = loadWordsAsTrie(wordFile)
+        self.assertEqual(len(self.words), len(trie))
+        self.assertEqual(sorted(self.words), list(trie))
+        for word in self.words:
+            self.assertTrue(word in trie)
+            self.assertEqual(sorted(neighbors(word, self.words, isWordInDictionary)),
+                             sorted(trie.neighbors(word)))
+        for word in ['COL', 'COLDS', 'ZZZZ', 'cold', '']:
+            self.assertFalse(word in trie)
+
+        for start, end in [('COLD', 'WARM'), ('LOVE', 'HATE')]:
+            expected = exploreQueueDQ(self.words, start, end, isWordInDictionary).collectTrail()
+            trail = exploreQueueDQ(trie, start, end, isWordInTrie).collectTrail()
+            self.assertEqual(len(expected), len(trail))
+            self.assertEqual([start, end], [trail[0], trail[-1]])
+
+    def testTrieSkipsOtherCharacters(self):
+        trie = ArrayTrie(['COLD', 'CORD', "AL'S", 'CARD'])
+        self.assertEqual(3, len(trie))
+        self.assertEqual(['CARD', 'COLD', 'CORD'], list(trie))
+        self.assertFalse("AL'S" in trie)
+        self.assertEqual(['CARD', 'COLD'], sorted(trie.neighbors('CORD')))
+        self.assertEqual([], trie.neighbors("AL'S"))
 
 if __name__ == '__main__':
     outputTiming('COLD', 'WARM', 1)
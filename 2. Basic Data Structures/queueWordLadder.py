@@ -6,15 +6,31 @@
     Use queue for storage
 
     Timing code passes in function to use for checking whether a word exists
+
+    Words of any length can be used; loadWordBuckets() groups the words of
+    a mixed-length dictionary by length so each ladder searches only the
+    words with the same length as its start. With a deletion index (from
+    buildDeletionIndex), exploreQueue also allows a step to insert or
+    delete a letter, so a ladder can change length.
     
     Author: George Heineman
 """
+import heapq
+import os
+import random
 import unittest
 import sys
+import time
 import timeit
+import tracemalloc
 
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+from wordLoader import loadWords, loadWordsByLength
+
 # Contains words, all in lower case.
 wordFile = "words.english.txt"
 alphabet = "ABCDEFGHIJKLMNOPQRSTUVWYXZ"
@@ -30,8 +46,9 @@ class Stage:
         trail = []
         node = self
         while node:
-            trail.insert(0, node.word)
+            trail.append(node.word)
             node = node.prior
+        trail.reverse()
         return trail
 
 def isWordInDictionary(d, word):
@@ -56,58 +73,107 @@ def isWordInSortedList(aList, tgt):
             return True
     return False
 
-def loadWordsAsDictionary(wordList):
-    """
-    Return Dictionary of four-letter words to explore, each with
-    a count of zero.
-    """
-    words = {}
-    with open(wordList) as fp:
-       line = fp.readline()
-       
-       while line:
-           word = line[:-1].upper()
-           if len(word) == 4:
-               words[word] = 0
-               
-           line = fp.readline()
-    return words
-
-def loadWordsAsList(wordList):
-    """
-    Return list of four-letter words to explore.
-    """
-    words = []
-    with open(wordList) as fp:
-       line = fp.readline()
-       
-       while line:
-           word = line[:-1].upper()
-           if len(word) == 4:
-               words.append(word)
-               
-           line = fp.readline()
-    return words
+def loadWordsAsDictionary(wordList, length=4):
+    """
+    Return Dictionary of words of given length (four by default) to explore,
+    each with a count of zero.
+    """
+    return dict.fromkeys(loadWords(wordList, length), 0)
+
+def loadWordsAsList(wordList, length=4):
+    """
+    Return list of words of given length (four by default) to explore.
+    """
+    return loadWords(wordList, length)
 
 def neighbors(word, words, isWord):
-    """Return valid neighboring 4-letter words of given word."""
+    """Return valid neighboring words (of the same length) of given word."""
     neighbors = []
     for let in alphabet:
-        for pos in range(0,4):
+        for pos in range(len(word)):
             newWord = word[0:pos] + let + word[pos+1:]
             if isWord(words, newWord) and newWord != word:
                 neighbors.append(newWord)
                 
     return neighbors
 
-def exploreQueue(words, start, end, isWord=isWordInDictionary):
-    """Using existing collection of words, find ladder from start to end"""
+def buildPatternIndex(words):
+    """
+    Return dictionary that maps each wildcard pattern, such as 'C_LD', to
+    the list of words matching it. Built once, this replaces the 104 calls
+    to isWord that neighbors() makes for each word.
+    """
+    patterns = {}
+    for word in words:
+        for pos in range(len(word)):
+            patterns.setdefault(word[:pos] + '_' + word[pos+1:], []).append(word)
+    return patterns
+
+def patternNeighbors(word, patterns):
+    """Return valid neighboring words of given word using pattern index."""
+    neighbors = []
+    for pos in range(len(word)):
+        for other in patterns.get(word[:pos] + '_' + word[pos+1:], []):
+            if other != word:
+                neighbors.append(other)
+    return neighbors
+
+def deletions(word):
+    """Return set of strings formed by deleting one letter from word."""
+    return { word[:pos] + word[pos+1:] for pos in range(len(word)) }
+
+def buildDeletionIndex(words):
+    """
+    Return dictionary that maps each word, and each string formed by deleting
+    one of its letters, to the list of words that produce it. Two words that
+    differ by one edit (substituting, inserting or deleting a letter) always
+    share a key, so the words sharing a key with a given word are the only
+    candidates to check, no matter how large the dictionary.
+    """
+    index = {}
+    for word in words:
+        index.setdefault(word, []).append(word)
+        for variant in deletions(word):
+            index.setdefault(variant, []).append(word)
+    return index
+
+def isOneEdit(word, other):
+    """Return True if other differs from word by exactly one substitution, insertion or deletion."""
+    if len(word) == len(other):
+        return hammingDistance(word, other) == 1
+    if len(word) > len(other):
+        word, other = other, word
+    if len(other) - len(word) != 1:
+        return False
+    pos = 0
+    while pos < len(word) and word[pos] == other[pos]:
+        pos += 1
+    return word[pos:] == other[pos+1:]
+
+def editNeighbors(word, index):
+    """
+    Return valid words (of any length) one edit away from word, using
+    deletion index from buildDeletionIndex.
+    """
+    candidates = set(index.get(word, []))
+    for variant in deletions(word):
+        candidates.update(index.get(variant, []))
+    return [other for other in candidates if other != word and isOneEdit(word, other)]
+
+def exploreQueue(words, start, end, isWord=isWordInDictionary, patterns=None, stats=None, deletionIndex=None):
+    """
+    Using existing collection of words, find ladder from start to end. When
+    a pattern index (from buildPatternIndex) is provided, it is used to find
+    neighbors instead of isWord. When a deletion index (from
+    buildDeletionIndex) is provided, each step may also insert or delete a
+    letter. If stats dictionary is provided, its 'expanded' entry records
+    the number of words whose neighbors were found.
+    """
     if not start in words:
-        raise Exception (start + " is not a valid four-letter word.")
+        raise Exception (start + " is not a valid word.")
     if not end in words:
-        raise Exception (end + " is not a valid four-letter word.")
+        raise Exception (end + " is not a valid word.")
 
-    from collections import deque
     active = deque()
     active.append(Stage(start))
 
@@ -121,7 +187,15 @@ def exploreQueue(words, start, end, isWord=isWordInDictionary):
             continue
         
         seen[st.word] = 1
-        for nxt in neighbors(st.word, words, isWord):
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + 1
+        if deletionIndex is not None:
+            candidates = editNeighbors(st.word, deletionIndex)
+        elif patterns is None:
+            candidates = neighbors(st.word, words, isWord)
+        else:
+            candidates = patternNeighbors(st.word, patterns)
+        for nxt in candidates:
             link = Stage(nxt, st)
             if nxt == end:
                 return link
@@ -130,11 +204,566 @@ def exploreQueue(words, start, end, isWord=isWordInDictionary):
     # No chain
     return None
 
+def exploreBidirectional(words, start, end, isWord=isWordInDictionary, patterns=None, stats=None):
+    """
+    Using existing collection of words, find ladder from start to end by
+    searching from both ends at once, always advancing whichever frontier
+    is smaller by one full level. When a word reached from one end has
+    already been reached from the other, the two trails are joined. The
+    whole level is completed so the shortest joined ladder is returned.
+    Arguments and result are the same as for exploreQueue.
+    """
+    if not start in words:
+        raise Exception (start + " is not a valid word.")
+    if not end in words:
+        raise Exception (end + " is not a valid word.")
+    if start == end:
+        return Stage(start)
+
+    # For each side, map each word reached to its Stage and its distance
+    forward = { start : (Stage(start), 0) }
+    backward = { end : (Stage(end), 0) }
+    forwardFrontier = [start]
+    backwardFrontier = [end]
+
+    while forwardFrontier and backwardFrontier:
+        if len(forwardFrontier) <= len(backwardFrontier):
+            frontier, reached, other = forwardFrontier, forward, backward
+        else:
+            frontier, reached, other = backwardFrontier, backward, forward
+
+        best = None
+        nextFrontier = []
+        for word in frontier:
+            if stats is not None:
+                stats['expanded'] = stats.get('expanded', 0) + 1
+            st, dist = reached[word]
+            if patterns is None:
+                candidates = neighbors(word, words, isWord)
+            else:
+                candidates = patternNeighbors(word, patterns)
+            for nxt in candidates:
+                if nxt in other:
+                    if best is None or other[nxt][1] < best[2]:
+                        best = (st, nxt, other[nxt][1])
+                elif nxt not in reached:
+                    reached[nxt] = (Stage(nxt, st), dist + 1)
+                    nextFrontier.append(nxt)
+
+        if best:
+            st, meet, _ = best
+            if reached is forward:
+                link = Stage(meet, st)
+                node = backward[meet][0].prior
+            else:
+                link = forward[meet][0]
+                node = st
+            while node:
+                link = Stage(node.word, link)
+                node = node.prior
+            return link
+
+        if reached is forward:
+            forwardFrontier = nextFrontier
+        else:
+            backwardFrontier = nextFrontier
+
+    # No chain
+    return None
+
+def buildIdIndex(words):
+    """
+    Return (wordList, ids) where wordList holds the words in sorted order
+    and ids maps each word to its position in wordList.
+    """
+    wordList = sorted(words)
+    return wordList, { word : i for i, word in enumerate(wordList) }
+
+def exploreIds(words, start, end, isWord=isWordInDictionary, patterns=None, stats=None, index=None):
+    """
+    Using existing collection of words, find ladder from start to end using
+    integer ids (from buildIdIndex, built if index is not provided) rather
+    than a Stage for each word reached. The predecessor of each word is
+    stored in a preallocated array('i'), which also records whether a word
+    has been seen, and the queue holds only ints. Stage objects are created
+    just for the words on the ladder that is returned.
+    """
+    if not start in words:
+        raise Exception (start + " is not a valid word.")
+    if not end in words:
+        raise Exception (end + " is not a valid word.")
+
+    wordList, ids = index if index else buildIdIndex(words)
+    prior = array('i', [-1]) * len(wordList)
+    source = ids[start]
+    target = ids[end]
+    prior[source] = source
+
+    active = deque([source])
+    while active and prior[target] < 0:
+        i = active.popleft()
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + 1
+        if patterns is None:
+            candidates = neighbors(wordList[i], words, isWord)
+        else:
+            candidates = patternNeighbors(wordList[i], patterns)
+        for nxt in candidates:
+            j = ids[nxt]
+            if prior[j] < 0:
+                prior[j] = i
+                if j == target:
+                    break
+                active.append(j)
+
+    if prior[target] < 0:
+        return None
+
+    # Rebuild the path once, from end back to start
+    path = [target]
+    while path[-1] != source:
+        path.append(prior[path[-1]])
+    link = None
+    for i in reversed(path):
+        link = Stage(wordList[i], link)
+    return link
+
+def outputMemory(pairs):
+    """
+    Generate report of peak memory (in bytes, as reported by tracemalloc)
+    and time for exploreQueue, which creates a Stage for every word reached,
+    and exploreIds for each (start, end) pair. Words, pattern index and id
+    index are built before measuring.
+    """
+    words = loadWordsAsDictionary(wordFile)
+    patterns = buildPatternIndex(words)
+    index = buildIdIndex(words)
+    print ('Ladder\t\tStage Bytes\tIds Bytes\tStage\t\tIds')
+    for start, end in pairs:
+        peaks = []
+        times = []
+        for explore in [lambda: exploreQueue(words, start, end, patterns=patterns),
+                        lambda: exploreIds(words, start, end, patterns=patterns, index=index)]:
+            tracemalloc.start()
+            explore()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            times.append(timeit.timeit(explore, number=5))
+        print (f'{start}->{end}\t{peaks[0]}\t\t{peaks[1]}\t\t{times[0]:f}\t{times[1]:f}')
+
+def encodeWord(word):
+    """
+    Return word as an int with 5 bits per letter, the first letter in the
+    lowest bits, where 'A' is 1 and 'Z' is 26.
+    """
+    code = 0
+    for pos, letter in enumerate(word):
+        value = ord(letter) - 64
+        if not 1 <= value <= 26:
+            raise ValueError(f'{word} contains {letter!r}, which cannot be encoded.')
+        code |= value << (5 * pos)
+    return code
+
+def isEncodable(word):
+    """Determine if word contains only the letters 'A' to 'Z', so encodeWord accepts it."""
+    return all('A' <= letter <= 'Z' for letter in word)
+
+def decodeWord(code, length):
+    """Return word of given length encoded as code by encodeWord."""
+    return ''.join(chr(64 + ((code >> (5 * pos)) & 31)) for pos in range(length))
+
+# Longest words for which buildBitmap returns a bitmap (4MB for five letters)
+bitmapLimit = 5
+
+def buildBitmap(words, length=4):
+    """
+    Return bitmap (as a bytearray of 2**(5*length) bits) with the bit for
+    the code of each word of given length set. For four-letter words this
+    takes 128KB. Since each extra letter makes the bitmap 32 times larger
+    (4GB for seven letters), for words longer than bitmapLimit a set of the
+    codes is returned instead. Words that cannot be encoded (such as "AL'S")
+    are skipped.
+    """
+    if length > bitmapLimit:
+        return set(encodeWord(word) for word in words if len(word) == length and isEncodable(word))
+
+    bitmap = bytearray(1 << (5 * length - 3))
+    for word in words:
+        if len(word) == length and isEncodable(word):
+            code = encodeWord(word)
+            bitmap[code >> 3] |= 1 << (code & 7)
+    return bitmap
+
+def encodedNeighbors(code, bitmap, length=4):
+    """
+    Return codes of valid neighboring words of the word with given code. Each
+    candidate is made by clearing the bits for one letter and setting others.
+    bitmap is either a bytearray or a set of codes, as returned by buildBitmap.
+    """
+    neighbors = []
+    if isinstance(bitmap, set):
+        for pos in range(length):
+            shift = 5 * pos
+            base = code & ~(31 << shift)
+            for value in range(1, 27):
+                candidate = base | (value << shift)
+                if candidate in bitmap and candidate != code:
+                    neighbors.append(candidate)
+        return neighbors
+
+    for pos in range(length):
+        shift = 5 * pos
+        base = code & ~(31 << shift)
+        for value in range(1, 27):
+            candidate = base | (value << shift)
+            if bitmap[candidate >> 3] & (1 << (candidate & 7)) and candidate != code:
+                neighbors.append(candidate)
+    return neighbors
+
+def exploreEncoded(words, start, end, isWord=isWordInDictionary, patterns=None, stats=None, bitmap=None):
+    """
+    Using existing collection of words, find ladder from start to end with
+    every word encoded as an int (see encodeWord), so checking a word is a
+    bit test in bitmap (from buildBitmap, built if not provided) and the
+    search creates no strings. Words are decoded only for the ladder that is
+    returned. isWord and patterns are ignored. Raises ValueError if start
+    or end cannot be encoded.
+    """
+    if not start in words:
+        raise Exception (start + " is not a valid word.")
+    if not end in words:
+        raise Exception (end + " is not a valid word.")
+    for word in [start, end]:
+        if not isEncodable(word):
+            raise ValueError(f'{word} contains letters other than A to Z, so it cannot be encoded.')
+
+    length = len(start)
+    if bitmap is None:
+        bitmap = buildBitmap(words, length)
+    source = encodeWord(start)
+    target = encodeWord(end)
+
+    # Map each code seen to the code from which it was first reached
+    prior = { source : None }
+    active = deque([source])
+    while active and target not in prior:
+        code = active.popleft()
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + 1
+        for nxt in encodedNeighbors(code, bitmap, length):
+            if nxt not in prior:
+                prior[nxt] = code
+                if nxt == target:
+                    break
+                active.append(nxt)
+
+    if target not in prior:
+        return None
+
+    trail = []
+    code = target
+    while code is not None:
+        trail.append(code)
+        code = prior[code]
+    link = None
+    for code in reversed(trail):
+        link = Stage(decodeWord(code, length), link)
+    return link
+
+# Set in each worker process by initLadderWorker
+workerWords = None
+workerIsWord = None
+workerPatterns = None
+
+def initLadderWorker(words, isWord, patterns):
+    """Record the words, isWord and pattern index in a worker process."""
+    global workerWords, workerIsWord, workerPatterns
+    workerWords = words
+    workerIsWord = isWord
+    workerPatterns = patterns
+
+def expandWords(share):
+    """Return list of (word, neighbors) for each word in share of a level."""
+    if workerPatterns is None:
+        return [(word, neighbors(word, workerWords, workerIsWord)) for word in share]
+    return [(word, patternNeighbors(word, workerPatterns)) for word in share]
+
+def ladderPool(words, workers=None, isWord=isWordInDictionary, patterns=None):
+    """
+    Return pool of worker processes for exploreParallel, each given its own
+    copy of words (and patterns) just once when it starts.
+    """
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=initLadderWorker,
+                               initargs=(words, isWord, patterns))
+
+def exploreParallel(words, start, end, isWord=isWordInDictionary, patterns=None, stats=None,
+                    pool=None, workers=None, minimumShare=64):
+    """
+    Using existing collection of words, find ladder from start to end by a
+    breadth-first search that expands one level at a time. Each level is
+    split into one share per worker of pool (from ladderPool, which is
+    created and shut down here if not provided), and the workers return
+    the neighbors of the words in their share. The coordinator processes
+    the results in order, keeping only words not yet seen, so the ladder
+    has the same (shortest) length as exploreQueue. Levels too small to
+    give each worker minimumShare words are expanded by the coordinator.
+    workers should match the size of a provided pool (both default to
+    os.cpu_count()).
+    """
+    if not start in words:
+        raise Exception (start + " is not a valid word.")
+    if not end in words:
+        raise Exception (end + " is not a valid word.")
+
+    if pool is None:
+        with ladderPool(words, workers, isWord, patterns) as pool:
+            return exploreParallel(words, start, end, isWord, patterns, stats, pool, workers, minimumShare)
+    workers = workers or os.cpu_count()
+
+    # Map each word seen to the word from which it was first reached
+    prior = { start : None }
+    level = [start]
+    while level and end not in prior:
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + len(level)
+        if len(level) < workers * minimumShare:
+            if patterns is None:
+                results = [(word, neighbors(word, words, isWord)) for word in level]
+            else:
+                results = [(word, patternNeighbors(word, patterns)) for word in level]
+        else:
+            size = (len(level) + workers - 1) // workers
+            shares = [level[i:i+size] for i in range(0, len(level), size)]
+            results = [pair for part in pool.map(expandWords, shares) for pair in part]
+
+        level = []
+        for word, candidates in results:
+            for nxt in candidates:
+                if nxt not in prior:
+                    prior[nxt] = word
+                    level.append(nxt)
+
+    if end not in prior:
+        return None
+
+    path = [end]
+    while prior[path[-1]] is not None:
+        path.append(prior[path[-1]])
+    link = None
+    for word in reversed(path):
+        link = Stage(word, link)
+    return link
+
+def outputParallelTiming(wordList=wordFile, length=4, num=200, minimumShare=64):
+    """
+    Generate report of time for exploreParallel to find ladders between num
+    random pairs of words of given length from wordList, using from 1 to
+    os.cpu_count() workers, along with the speedup over one worker and the
+    time for exploreQueue. Parallel search only helps once levels hold
+    many thousands of words, so use a large dictionary for wordList.
+    """
+    words = loadWordsAsDictionary(wordList, length)
+    pairs = randomPairs(words, num)
+
+    begin = time.perf_counter()
+    exploreAll(exploreQueue, words, pairs)
+    print (f'exploreQueue: {time.perf_counter() - begin:f}')
+
+    print ('Workers\tSeconds\t\tSpeedup')
+    baseline = None
+    for workers in range(1, os.cpu_count() + 1):
+        with ladderPool(words, workers) as pool:
+            begin = time.perf_counter()
+            for start, end in pairs:
+                exploreParallel(words, start, end, pool=pool, workers=workers, minimumShare=minimumShare)
+            elapsed = time.perf_counter() - begin
+        baseline = baseline or elapsed
+        print (f'{workers}\t{elapsed:f}\t{baseline / elapsed:.2f}')
+
+def hammingDistance(word, other):
+    """Return number of positions in which word and other differ."""
+    return sum(1 for a, b in zip(word, other) if a != b)
+
+def exploreAStar(words, start, end, isWord=isWordInDictionary, patterns=None, stats=None):
+    """
+    Using existing collection of words, find ladder from start to end with
+    A* search. Since each step changes one letter, the number of positions
+    in which a word differs from end never overestimates the steps that
+    remain, so the first time end is removed from the heap its ladder is
+    as short as possible. Ties are broken in favor of longer partial
+    ladders. Arguments and result are the same as for exploreQueue.
+    """
+    if not start in words:
+        raise Exception (start + " is not a valid word.")
+    if not end in words:
+        raise Exception (end + " is not a valid word.")
+
+    # Entries are (estimated length, -steps so far, counter, Stage) where the
+    # counter ensures Stage objects are never compared.
+    count = 0
+    active = [(hammingDistance(start, end), 0, count, Stage(start))]
+    seen = {}
+
+    while active:
+        _, negSteps, _, st = heapq.heappop(active)
+        if st.word == end:
+            return st
+        if st.word in seen:
+            continue
+
+        seen[st.word] = 1
+        if stats is not None:
+            stats['expanded'] = stats.get('expanded', 0) + 1
+        if patterns is None:
+            candidates = neighbors(st.word, words, isWord)
+        else:
+            candidates = patternNeighbors(st.word, patterns)
+        steps = 1 - negSteps
+        for nxt in candidates:
+            if nxt not in seen:
+                count += 1
+                heapq.heappush(active, (steps + hammingDistance(nxt, end), -steps, count, Stage(nxt, st)))
+
+    # No chain
+    return None
+
+def exploreAll(explore, words, pairs, patterns=None, stats=None):
+    """Use explore to find a ladder for each (start, end) pair, returning list of ladders."""
+    return [explore(words, start, end, patterns=patterns, stats=stats) for start, end in pairs]
+
+def randomPairs(words, num, seed=0):
+    """Return list of num random pairs of distinct words."""
+    rng = random.Random(seed)
+    wordList = sorted(words)
+    return [tuple(rng.sample(wordList, 2)) for _ in range(num)]
+
+def outputRandomPairs(num=2000):
+    """
+    Generate report of total time and words expanded by exploreQueue,
+    exploreBidirectional and exploreAStar (all using the pattern index) to
+    find ladders between num random pairs of words, confirming each finds
+    ladders of the same length.
+    """
+    words = loadWordsAsDictionary(wordFile)
+    patterns = buildPatternIndex(words)
+    pairs = randomPairs(words, num)
+
+    print ('Method\t\tSeconds\t\tExpanded')
+    lengths = None
+    for explore in [exploreQueue, exploreBidirectional, exploreAStar]:
+        stats = {}
+        begin = time.perf_counter()
+        ladders = exploreAll(explore, words, pairs, patterns, stats)
+        elapsed = time.perf_counter() - begin
+        found = [len(ladder.collectTrail()) if ladder else 0 for ladder in ladders]
+        if lengths is None:
+            lengths = found
+        elif found != lengths:
+            print (f'{explore.__name__} found ladders of different length')
+        print (f"{explore.__name__[7:]:<13}\t{elapsed:f}\t{stats.get('expanded', 0)}")
+
+def loadWordBuckets(wordList, lengths=None):
+    """
+    Return dictionary mapping each word length (restricted to lengths, if
+    given) to a (words, patterns) pair for the words of that length in
+    wordList, where words is a dictionary as from loadWordsAsDictionary and
+    patterns is its index from buildPatternIndex. The file is read once.
+    """
+    buckets = {}
+    for length, bucket in loadWordsByLength(wordList, lengths).items():
+        words = dict.fromkeys(bucket, 0)
+        buckets[length] = (words, buildPatternIndex(words))
+    return buckets
+
+def exploreBucket(buckets, start, end, explore=exploreBidirectional, stats=None):
+    """
+    Use explore to find ladder from start to end within the bucket (from
+    loadWordBuckets) of words with the same length as start.
+    """
+    if len(start) != len(end):
+        raise Exception (f'{start} and {end} have different lengths.')
+    if len(start) not in buckets:
+        raise Exception (f'There are no words of length {len(start)}.')
+    words, patterns = buckets[len(start)]
+    return explore(words, start, end, patterns=patterns, stats=stats)
+
+def outputLengthTiming(wordList=wordFile, lengths=range(3,9), num=100):
+    """
+    Generate timing report for finding ladders between num random pairs of
+    words for each word length, using exploreQueue, exploreBidirectional
+    and exploreAStar. Use a large mixed-length dictionary (one word per
+    line) for wordList; lengths without words are skipped.
+    """
+    buckets = loadWordBuckets(wordList, lengths)
+    print ('Length\tWords\tLadders\tQueue\t\tBidirectional\tAStar')
+    for length in lengths:
+        if length not in buckets:
+            continue
+        pairs = randomPairs(buckets[length][0], num)
+        row = []
+        for explore in [exploreQueue, exploreBidirectional, exploreAStar]:
+            begin = time.perf_counter()
+            ladders = [exploreBucket(buckets, start, end, explore) for start, end in pairs]
+            row.append(f'{time.perf_counter() - begin:f}')
+        found = sum(1 for ladder in ladders if ladder)
+        print (f'{length}\t{len(buckets[length][0])}\t{found}\t' + '\t'.join(row))
+
+def outputEditTiming(wordList=wordFile, num=1000):
+    """
+    Generate report of the time to build the deletion index for all words
+    in wordList and the time to find the neighbors (one edit away) of num
+    random words using the index and by checking every word (estimated
+    from one percent of them), followed by the time to find ladders between
+    num/10 random pairs with exploreQueue.
+    Use a large mixed-length dictionary for wordList.
+    """
+    words = dict.fromkeys(loadWords(wordList, None), 0)
+    begin = time.perf_counter()
+    index = buildDeletionIndex(words)
+    build = time.perf_counter() - begin
+    print (f'{len(words)} words, {len(index)} keys, built in {build:f} seconds')
+
+    sample = random.Random(0).sample(sorted(words), min(num, len(words)))
+    print ('Neighbors\tIndex\t\tScan')
+    begin = time.perf_counter()
+    for word in sample:
+        editNeighbors(word, index)
+    lookup = time.perf_counter() - begin
+    scanned = sample[:max(1, num // 100)]
+    begin = time.perf_counter()
+    for word in scanned:
+        [other for other in words if other != word and isOneEdit(word, other)]
+    scan = (time.perf_counter() - begin) * len(sample) / len(scanned)
+    print (f'{len(sample)}\t\t{lookup:f}\t{scan:f}')
+
+    pairs = randomPairs(words, max(1, num // 10))
+    begin = time.perf_counter()
+    found = sum(1 for start, end in pairs if exploreQueue(words, start, end, deletionIndex=index))
+    print (f'{found} of {len(pairs)} ladders found in {time.perf_counter() - begin:f} seconds')
+
+def outputExpanded(pairs):
+    """
+    Generate report of the number of words expanded (whose neighbors are
+    found) by exploreQueue, exploreBidirectional and exploreAStar for each
+    (start, end) pair, along with the length of the ladder found.
+    """
+    words = loadWordsAsDictionary(wordFile)
+    patterns = buildPatternIndex(words)
+    print ('Ladder\t\tQueue\tBidirectional\tAStar\tLength')
+    for start, end in pairs:
+        row = []
+        for explore in [exploreQueue, exploreBidirectional, exploreAStar]:
+            stats = {}
+            ladder = explore(words, start, end, patterns=patterns, stats=stats)
+            row.append(stats.get('expanded', 0))
+        length = len(ladder.collectTrail()) if ladder else '-'
+        print (f'{start}->{end}\t{row[0]}\t{row[1]}\t\t{row[2]}\t{length}')
+
 def outputTiming(start, end):
     """
-    Generate timing report for the three different approaches.
+    Generate timing report for the different approaches.
     """
-    print ('List\t\tBASearch\tDictionary')
+    print ('List\t\tBASearch\tDictionary\tPattern\t\tBidirectional\tEncoded')
 
     trials = ['L', 'SL', 'D']
     loadMethods = ['loadWordsAsList', 'loadWordsAsList', 'loadWordsAsDictionary']
@@ -143,20 +772,187 @@ def outputTiming(start, end):
     counts = {}
     for trial,load,valid in zip(trials,loadMethods,valids):
         counts[trial] = timeit.timeit(stmt=f'exploreQueue(words,"{start}","{end}",{valid})', number=5,
-                setup=f'from __main__ import {valid},{load},exploreQueue,wordFile\nwords={load}(wordFile)')
+                setup=f'words={load}(wordFile)', globals=globals())
+    counts['P'] = timeit.timeit(stmt=f'exploreQueue(words,"{start}","{end}",patterns=patterns)', number=5,
+                setup='words=loadWordsAsDictionary(wordFile)\npatterns=buildPatternIndex(words)', globals=globals())
+    trials.append('P')
+    counts['B'] = timeit.timeit(stmt=f'exploreBidirectional(words,"{start}","{end}",patterns=patterns)', number=5,
+                setup='words=loadWordsAsDictionary(wordFile)\npatterns=buildPatternIndex(words)', globals=globals())
+    trials.append('B')
+    counts['E'] = timeit.timeit(stmt=f'exploreEncoded(words,"{start}","{end}",bitmap=bitmap)', number=5,
+                setup='words=loadWordsAsDictionary(wordFile)\nbitmap=buildBitmap(words)', globals=globals())
+    trials.append('E')
 
     results = '\t'.join(f'{counts[trial]:f}' for trial in trials)
     print (results)
+    print()
+    outputExpanded([(start, end), ('ABRI', 'ISMS')])
+
+def registerBenchmarks(harness):
+    """
+    Register COLD to WARM word ladder with benchmark.py harness. The List
+    approach is left out since a single search takes over a minute.
+    """
+    harness.register('wordLadder', 'BASearch', exploreQueue,
+                     lambda n: (loadWordsAsList(wordFile), 'COLD', 'WARM', isWordInSortedList))
+    harness.register('wordLadder', 'Dictionary', exploreQueue,
+                     lambda n: (loadWordsAsDictionary(wordFile), 'COLD', 'WARM', isWordInDictionary))
+    def patternSetup(n):
+        words = loadWordsAsDictionary(wordFile)
+        return (words, 'COLD', 'WARM', isWordInDictionary, buildPatternIndex(words))
+    harness.register('wordLadder', 'Pattern', exploreQueue, patternSetup)
+    harness.register('wordLadder', 'Bidirectional', exploreBidirectional, patternSetup)
+    harness.register('wordLadder', 'AStar', exploreAStar, patternSetup)
+
+    def idSetup(n):
+        words = loadWordsAsDictionary(wordFile)
+        return (words, 'COLD', 'WARM', isWordInDictionary, buildPatternIndex(words), None, buildIdIndex(words))
+    harness.register('wordLadder', 'Ids', exploreIds, idSetup)
+
+    def encodedSetup(n):
+        words = loadWordsAsDictionary(wordFile)
+        return (words, 'COLD', 'WARM', isWordInDictionary, None, None, buildBitmap(words))
+    harness.register('wordLadder', 'Encoded', exploreEncoded, encodedSetup)
+
+    # Buckets are only loaded if the benchmark runs, then shared across lengths
+    loaded = {}
+    def lengthBuckets():
+        if not loaded:
+            loaded.update(loadWordBuckets(wordFile, range(3,9)))
+        return loaded
+    def lengthSetup(n):
+        buckets = lengthBuckets()
+        return (buckets, randomPairs(buckets[n][0], 100))
+    def exploreLength(buckets, pairs):
+        return [exploreBucket(buckets, start, end) for start, end in pairs]
+    harness.register('wordLadderLengths', 'Bidirectional', exploreLength, lengthSetup,
+                     lambda: sorted(lengthBuckets()))
+
+    def pairsSetup(explore):
+        def setup(n):
+            words = loadWordsAsDictionary(wordFile)
+            return (explore, words, randomPairs(words, n), buildPatternIndex(words))
+        return setup
+    for explore in [exploreQueue, exploreBidirectional, exploreAStar]:
+        harness.register('wordLadderPairs', explore.__name__[7:], exploreAll, pairsSetup(explore), [200])
+
+class QueueWordLadderTest(unittest.TestCase):
+    """
+    Unit test cases to validate each search against exploreQueue.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.words = loadWordsAsDictionary(wordFile)
+        cls.patterns = buildPatternIndex(cls.words)
+        isolated = next(w for w in sorted(cls.words) if not patternNeighbors(w, cls.patterns))
+        cls.pairs = [('COLD', 'WARM'), ('ABRI', 'ISMS'), ('COLD', isolated)] + randomPairs(cls.words, 10, 7)
+
+    def assertMatchesQueue(self, search):
+        """
+        Check search(start, end) returns a valid ladder of the same length as
+        exploreQueue (or None when it does) for every pair.
+        """
+        for start, end in self.pairs:
+            expected = exploreQueue(self.words, start, end, patterns=self.patterns)
+            ladder = search(start, end)
+            if expected is None:
+                self.assertIsNone(ladder)
+                continue
+            trail = ladder.collectTrail()
+            self.assertEqual(len(expected.collectTrail()), len(trail))
+            self.assertEqual([start, end], [trail[0], trail[-1]])
+            for word, nxt in zip(trail, trail[1:]):
+                self.assertTrue(nxt in self.words)
+                self.assertEqual(1, sum(a != b for a, b in zip(word, nxt)))
+
+    def testQueue(self):
+        self.assertMatchesQueue(lambda start, end: exploreQueue(self.words, start, end))
+        self.assertEqual(['COLD', 'CORD', 'CARD', 'WARD', 'WARM'],
+                         exploreQueue(self.words, 'COLD', 'WARM').collectTrail())
+
+    def testBidirectional(self):
+        self.assertMatchesQueue(lambda start, end: exploreBidirectional(self.words, start, end))
+        self.assertMatchesQueue(lambda start, end: exploreBidirectional(self.words, start, end,
+                                                                        patterns=self.patterns))
+        stats = {}
+        exploreBidirectional(self.words, 'ABRI', 'ISMS', patterns=self.patterns, stats=stats)
+        self.assertTrue(0 < stats['expanded'] < 1000)
+
+    def testAStar(self):
+        self.assertMatchesQueue(lambda start, end: exploreAStar(self.words, start, end, patterns=self.patterns))
+        self.assertEqual(0, hammingDistance('COLD', 'COLD'))
+        self.assertEqual(4, hammingDistance('COLD', 'WARM'))
+
+    def testIds(self):
+        index = buildIdIndex(self.words)
+        self.assertMatchesQueue(lambda start, end: exploreIds(self.words, start, end, patterns=self.patterns))
+        self.assertMatchesQueue(lambda start, end: exploreIds(self.words, start, end, index=index))
+
+    def testParallel(self):
+        # minimumShare=1 so every level is split between the workers
+        with ladderPool(self.words, 2, patterns=self.patterns) as pool:
+            self.assertMatchesQueue(lambda start, end: exploreParallel(self.words, start, end,
+                                    patterns=self.patterns, pool=pool, workers=2, minimumShare=1))
+        ladder = exploreParallel(self.words, 'COLD', 'WARM', workers=2)
+        self.assertEqual(5, len(ladder.collectTrail()))
+
+    def testEncoded(self):
+        self.assertEqual('COLD', decodeWord(encodeWord('COLD'), 4))
+        with self.assertRaises(ValueError):
+            encodeWord('cold')
+        bitmap = buildBitmap(self.words)
+        self.assertEqual(2**17, len(bitmap))
+        self.assertMatchesQueue(lambda start, end: exploreEncoded(self.words, start, end, bitmap=bitmap))
+
+    def testEncodedLongWords(self):
+        words = dict.fromkeys(['CLOUDED', 'CLOTTED', 'PLOTTED', 'SKIPPED', 'CLOUTED'], 0)
+        self.assertTrue(isinstance(buildBitmap(words, 7), set))
+        self.assertEqual(['CLOUDED', 'CLOUTED', 'CLOTTED', 'PLOTTED'],
+                         exploreEncoded(words, 'CLOUDED', 'PLOTTED').collectTrail())
+        self.assertIsNone(exploreEncoded(words, 'SKIPPED', 'CLOUDED'))
+
+    def testEncodedSkipsOtherCharacters(self):
+        words = dict.fromkeys(['COLD', 'CORD', "AL'S", 'CARD'], 0)
+        self.assertEqual(exploreQueue(words, 'COLD', 'CARD').collectTrail(),
+                         exploreEncoded(words, 'COLD', 'CARD').collectTrail())
+        with self.assertRaises(ValueError):
+            exploreEncoded(words, "AL'S", 'CARD')
+        words["CAN'T"] = 0
+        self.assertFalse(any(buildBitmap(words, 5)))
+        with self.assertRaises(ValueError):
+            exploreEncoded(words, 'COLD', "CAN'T")
+
+    def testEditLadders(self):
+        words = dict.fromkeys(['COLD', 'COD', 'CLOD', 'CLOUD', 'CORD', 'CO', 'SCOLD', 'LOUD', 'WARM'], 0)
+        index = buildDeletionIndex(words)
+        for word in words:
+            expected = sorted(other for other in words if isOneEdit(word, other))
+            self.assertEqual(expected, sorted(editNeighbors(word, index)))
+        self.assertFalse(isOneEdit('COLD', 'COLD'))
+        self.assertFalse(isOneEdit('CO', 'COLD'))
+
+        ladder = exploreQueue(words, 'COLD', 'CLOUD', deletionIndex=index)
+        self.assertEqual(['COLD', 'COD', 'CLOD', 'CLOUD'], ladder.collectTrail())
+        self.assertIsNone(exploreQueue(words, 'COLD', 'WARM', deletionIndex=index))
+        self.assertIsNone(exploreQueue(words, 'COLD', 'CLOUD'))
 
 if __name__ == '__main__':
     wds = loadWordsAsDictionary(wordFile)
     ladder = exploreQueue(wds, 'COLD', 'WARM')
     print (ladder.collectTrail())
+    print (exploreBidirectional(wds, 'COLD', 'WARM').collectTrail())
+    print (exploreAStar(wds, 'COLD', 'WARM').collectTrail())
     print()
 
     # Time if you want to
     #outputTiming('COLD', 'WARM')
+    #outputRandomPairs()
+    #outputMemory([('COLD', 'WARM'), ('ABRI', 'ISMS')])
+    #outputLengthTiming(sys.argv[1] if len(sys.argv) > 1 else wordFile)
+    #outputParallelTiming(sys.argv[1] if len(sys.argv) > 1 else wordFile)
+    #outputEditTiming(sys.argv[1] if len(sys.argv) > 1 else wordFile)
     print("exploreQueue(wds, 'COLD', 'WARM').collectTrail()")
+    unittest.main()
     
 
 
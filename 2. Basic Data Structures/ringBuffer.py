@@ -0,0 +1,96 @@
+"""
+    Queue of integers stored in a circular buffer backed by a typed array.
+
+    Values are stored directly in an array (32-bit signed integers by
+    default), so there is no Python object per element. The buffer doubles
+    in size when full, so append() and popleft() both take amortized O(1)
+    time.
+"""
+import unittest
+
+from array import array
+
+class RingBuffer:
+    """
+    First-in, first-out queue of integers. typecode is any integer typecode
+    supported by array, and capacity the initial number of slots.
+    """
+    def __init__(self, typecode='i', capacity=16):
+        self.typecode = typecode
+        self.data = array(typecode, [0]) * max(1, capacity)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def append(self, value):
+        """Add value to the end of the queue."""
+        capacity = len(self.data)
+        if self.size == capacity:
+            self.grow()
+            capacity = len(self.data)
+        tail = self.head + self.size
+        if tail >= capacity:
+            tail -= capacity
+        self.data[tail] = value
+        self.size += 1
+
+    def popleft(self):
+        """Remove and return the value at the front of the queue."""
+        if self.size == 0:
+            raise IndexError('pop from an empty RingBuffer')
+        value = self.data[self.head]
+        self.head += 1
+        if self.head == len(self.data):
+            self.head = 0
+        self.size -= 1
+        return value
+
+    def peek(self):
+        """Return the value at the front of the queue without removing it."""
+        if self.size == 0:
+            raise IndexError('peek at an empty RingBuffer')
+        return self.data[self.head]
+
+    def grow(self):
+        """Double capacity, moving values so the front is at index 0."""
+        capacity = len(self.data)
+        self.data = self.data[self.head:] + self.data[:self.head] + array(self.typecode, [0]) * capacity
+        self.head = 0
+
+class RingBufferTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def testFifo(self):
+        rb = RingBuffer(capacity=4)
+        self.assertFalse(rb)
+        for i in range(3):
+            rb.append(i)
+        self.assertEqual(0, rb.peek())
+        self.assertEqual(0, rb.popleft())
+
+        # Wrap around the end and then force growth while wrapped
+        for i in range(3, 10):
+            rb.append(i)
+        self.assertEqual(9, len(rb))
+        self.assertEqual(list(range(1, 10)), [rb.popleft() for _ in range(9)])
+        self.assertFalse(rb)
+        with self.assertRaises(IndexError):
+            rb.popleft()
+
+    def testTypecode(self):
+        rb = RingBuffer('q', 1)
+        rb.append(2 ** 40)
+        rb.append(-1)
+        self.assertEqual(2 ** 40, rb.popleft())
+        self.assertEqual(-1, rb.popleft())
+        with self.assertRaises(OverflowError):
+            RingBuffer('b').append(1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+    Load words of a given length (or of every length, grouped by length)
+    from a dictionary file, one word per line.
+
+    The first time a dictionary is loaded, the whole file is read in one
+    pass, the words of the requested length are converted to upper case,
+    and the result is saved alongside the dictionary in a binary cache file.
+    Later loads read just the cache, which is a single read and a single
+    split. The cache records the size and modification time of the
+    dictionary it was built from, and is rebuilt whenever either changes.
+
+    If the cache cannot be written (for example, the directory is read-only)
+    the words are still returned; the next load simply reads the file again.
+"""
+import os
+import shutil
+import struct
+import tempfile
+import timeit
+import unittest
+
+# Identifies cache files, followed by the size and modification time (in
+# nanoseconds) of the dictionary, the word length (allLengths for every
+# length) and the number of words.
+cacheMagic = b'WRDC0001'
+cacheHeader = struct.Struct('<8sqqqq')
+allLengths = -1
+
+def cachePath(wordList, length):
+    """Return path of the cache file for words of length (None for all) in wordList."""
+    return f"{wordList}.{'all' if length is None else length}.cache"
+
+def readWordFile(wordList, length):
+    """
+    Return list of upper case words of length (or all words if length is
+    None) in wordList, read in one pass. Each line holds one word, which may
+    contain spaces; blank lines are ignored.
+    """
+    with open(wordList) as fp:
+        words = [line.strip() for line in fp.read().upper().splitlines()]
+    words = [word for word in words if word]
+    if length is None:
+        return words
+    return [word for word in words if len(word) == length]
+
+def readCache(path, size, mtime, length):
+    """Return list of words in cache at path, or None if missing or out of date."""
+    try:
+        with open(path, 'rb') as fp:
+            data = fp.read()
+    except OSError:
+        return None
+
+    if len(data) < cacheHeader.size:
+        return None
+    magic, cachedSize, cachedTime, cachedLength, count = cacheHeader.unpack_from(data)
+    if magic != cacheMagic or (cachedSize, cachedTime, cachedLength) != (size, mtime, length):
+        return None
+    if count == 0:
+        return []
+    words = data[cacheHeader.size:].decode().split('\n')
+    if len(words) != count:
+        return None
+    return words
+
+def writeCache(path, size, mtime, length, words):
+    """
+    Write words to the cache at path, replacing any existing cache only once
+    the new one is complete. Return False if the cache could not be written.
+    """
+    directory = os.path.dirname(path) or '.'
+    try:
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=directory)
+    except OSError:
+        return False
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(cacheHeader.pack(cacheMagic, size, mtime, length, len(words)))
+            fp.write('\n'.join(words).encode())
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    return True
+
+def loadWords(wordList, length=4, useCache=True):
+    """
+    Return list of upper case words of length (or all words if length is
+    None) from wordList, in the order they appear, using (and if necessary
+    rebuilding) its binary cache.
+    """
+    if not useCache:
+        return readWordFile(wordList, length)
+
+    info = os.stat(wordList)
+    path = cachePath(wordList, length)
+    key = allLengths if length is None else length
+    words = readCache(path, info.st_size, info.st_mtime_ns, key)
+    if words is None:
+        words = readWordFile(wordList, length)
+        writeCache(path, info.st_size, info.st_mtime_ns, key, words)
+    return words
+
+def loadWordsByLength(wordList, lengths=None, useCache=True):
+    """
+    Return dictionary mapping each word length (restricted to lengths, if
+    given) to the list of upper case words of that length in wordList,
+    built from a single pass over the file (or its cache).
+    """
+    buckets = {}
+    for word in loadWords(wordList, None, useCache):
+        if lengths is None or len(word) in lengths:
+            buckets.setdefault(len(word), []).append(word)
+    return buckets
+
+class WordLoaderTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'words.txt')
+        with open(self.path, 'w') as fp:
+            fp.write('cold\nCORD\nto\ncard\nwarmer\nWARD\nwarm')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testLoad(self):
+        expected = ['COLD', 'CORD', 'CARD', 'WARD', 'WARM']
+        self.assertEqual(expected, loadWords(self.path, useCache=False))
+        self.assertEqual(expected, loadWords(self.path))
+        self.assertTrue(os.path.exists(cachePath(self.path, 4)))
+        self.assertEqual(expected, loadWords(self.path))
+        self.assertEqual(['WARMER'], loadWords(self.path, 6))
+        self.assertEqual([], loadWords(self.path, 5))
+        self.assertEqual([], loadWords(self.path, 5))
+
+    def testLoadByLength(self):
+        buckets = loadWordsByLength(self.path)
+        self.assertEqual([2, 4, 6], sorted(buckets))
+        self.assertEqual(['TO'], buckets[2])
+        self.assertEqual(loadWords(self.path), buckets[4])
+        self.assertTrue(os.path.exists(cachePath(self.path, None)))
+        self.assertEqual(buckets, loadWordsByLength(self.path))
+        self.assertEqual({6 : ['WARMER']}, loadWordsByLength(self.path, [3, 6]))
+
+    def testLines(self):
+        with open(self.path, 'w') as fp:
+            fp.write('ice cream\n  cold \n\nwarm\n')
+        self.assertEqual(['ICE CREAM', 'COLD', 'WARM'], loadWords(self.path, None))
+        self.assertEqual(['ICE CREAM', 'COLD', 'WARM'], loadWords(self.path, None))
+        self.assertEqual(['ICE CREAM'], loadWords(self.path, 9))
+        self.assertEqual([], loadWords(self.path, 0))
+        self.assertNotEqual(cachePath(self.path, None), cachePath(self.path, 0))
+
+    def testInvalidate(self):
+        loadWords(self.path)
+        with open(self.path, 'a') as fp:
+            fp.write('\nwore')
+        self.assertEqual('WORE', loadWords(self.path)[-1])
+
+    def testCorruptCache(self):
+        loadWords(self.path)
+        with open(cachePath(self.path, 4), 'wb') as fp:
+            fp.write(b'garbage')
+        self.assertEqual(5, len(loadWords(self.path)))
+
+def outputTiming(wordList='words.english.txt'):
+    """
+    Generate timing report comparing the original readline() loop against
+    a single bulk read and a load from the binary cache.
+    """
+    def readLines():
+        words = []
+        with open(wordList) as fp:
+            line = fp.readline()
+            while line:
+                word = line[:-1].upper()
+                if len(word) == 4:
+                    words.append(word)
+                line = fp.readline()
+        return words
+
+    loadWords(wordList)
+    print ('Readline\tBulk\t\tCache')
+    times = [timeit.timeit(readLines, number=100),
+             timeit.timeit(lambda: loadWords(wordList, useCache=False), number=100),
+             timeit.timeit(lambda: loadWords(wordList), number=100)]
+    print ('\t'.join(f'{t:f}' for t in times))
+
+if __name__ == '__main__':
+    outputTiming()
+    unittest.main()
@@ -5,6 +5,7 @@
   situation from practice, namely, adding a collection of items to
   an already sorted list.
 """
+import random
 import timeit
 
 def insertionSort (A):
@@ -79,15 +80,28 @@ def outputTiming():
             iSort[n] = 0
         else:
             iSort[n] = timeit.timeit(stmt=f'insertionSort(oldSortedData + newData)', number=100,
-                setup=f'import random\nfrom __main__ import insertionSort\noldSortedData = list(range(0, {n}))\nnewData=random.sample(range({n}//4), {n}//4)')
+                setup=f'import random\noldSortedData = list(range(0, {n}))\nnewData=random.sample(range({n}//4), {n}//4)', globals=globals())
         mSort[n] = timeit.timeit(stmt=f'mergeSort(newData + oldSortedData)', number=100,
-                setup=f'import random\nfrom __main__ import mergeSort\noldSortedData = list(range(0, {n}))\nnewData=random.sample(range({n}//4), {n}//4)')
+                setup=f'import random\noldSortedData = list(range(0, {n}))\nnewData=random.sample(range({n}//4), {n}//4)', globals=globals())
         tSort[n] = timeit.timeit(stmt=f'sorted(oldSortedData + newData)', number=100,
                 setup=f'import random\noldSortedData = list(range(0, {n}))\nnewData=random.sample(range({n}//4), {n}//4)')
         
     for t in trials:
         print (f'{t}\t{iSort[t]:.4f}\t{mSort[t]:.4f}\t{tSort[t]:.4f}')
 
+def registerBenchmarks(harness):
+    """
+    Register the three sorting algorithms with benchmark.py harness, sorting
+    N sorted integers followed by N/4 random integers as outputTiming does.
+    """
+    def data(n):
+        return (list(range(0, n)) + random.sample(range(n//4), n//4),)
+    harness.register('sorting', 'insertionSort', lambda A: insertionSort(list(A)), data,
+                     [2**_ for _ in range(4,12)])
+    harness.register('sorting', 'mergeSort', lambda A: mergeSort(list(A)), data,
+                     [2**_ for _ in range(4,16)])
+    harness.register('sorting', 'timSort', sorted, data, [2**_ for _ in range(4,16)])
+
 if __name__ == '__main__':
     print ("Quick Validation of working MergeSort and InsertionSort.")
     x = list(range(16))
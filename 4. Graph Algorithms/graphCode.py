@@ -304,6 +304,16 @@ def floydWarshall(G):
     return wordLadderBFS_deque(G, allNodes[maxi], allNodes[maxj])
 
 
+def registerBenchmarks(harness):
+    """Register graph construction and word ladder searches with benchmark.py harness."""
+    harness.register('graph', 'loadGraph', loadGraph, lambda n: (wordFile,))
+    harness.register('graph', 'BFS', lambda G: BreadthFirstSearch(G).wordLadder('COLD', 'WARM'),
+                     lambda n: (loadGraph(wordFile),), number=10)
+    harness.register('graph', 'DFS', lambda G: DepthFirstSearch(G).wordLadder('COLD', 'WARM'),
+                     lambda n: (loadGraph(wordFile),), number=10)
+    harness.register('graph', 'wordLadderBFS_deque', wordLadderBFS_deque,
+                     lambda n: (loadGraph(wordFile), 'COLD', 'WARM'), number=10)
+
 def loadDefaultGraph():
     return loadGraph(wordFile)
 
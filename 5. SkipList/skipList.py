@@ -135,10 +135,10 @@ def stressTestTiming():
         averages = {}
         structures = [addToSkipList, addToAVL]    
         averages['AVL'] = timeit.timeit(stmt=f'stressTest(BinaryTree(), addToAVL, {trial})', number=10,
-                        setup=f'import random\nfrom avl import BinaryTree\nfrom __main__ import stressTest,addToAVL\nrandom.seed({trial})')/10
+                        setup=f'import random\nfrom avl import BinaryTree\nrandom.seed({trial})', globals=globals())/10
 
         averages['SL'] = timeit.timeit(stmt=f'stressTest(SkipList(), addToSkipList, {trial})', number=10,
-                        setup=f'import random\nfrom pyskiplist import SkipList\nfrom __main__ import stressTest,addToSkipList\nrandom.seed({trial})')/10
+                        setup=f'import random\nfrom pyskiplist import SkipList\nrandom.seed({trial})', globals=globals())/10
 
         results = '\t'.join(f'{averages[s]:.4f}' for s in ['SL', 'AVL'])
                        
@@ -156,7 +156,7 @@ def outputPerformanceTiming():
         structures = ['constructSL', 'constructAVL']    
         for s in structures:
             trials[s] = timeit.timeit(stmt=f'search(structure, targets)', number=100,
-                        setup=f'import random\nfrom __main__ import {s},search\nrandom.seed({trial})\ntargets={targets}\nstructure = {s}({build})')/100
+                        setup=f'import random\nrandom.seed({trial})\ntargets={targets}\nstructure = {s}({build})', globals=globals())/100
         results = '\t'.join(f'{trials[s]:.4f}' for s in structures)
                        
         print (f'{trial}\t{results}')
@@ -175,15 +175,30 @@ def outputConstructionTiming():
             
         for meth in methods:
             counts[meth] = timeit.timeit(stmt=f'{meth}(numbers)', number=100,
-                        setup=f'import random\nfrom __main__ import {meth}\nrandom.seed({trial})\nnumbers = {numbers}')/100
+                        setup=f'import random\nrandom.seed({trial})\nnumbers = {numbers}', globals=globals())/100
             ascending[meth] = timeit.timeit(stmt=f'{meth}(numbers)', number=100,
-                        setup=f'import random\nfrom __main__ import {meth}\nrandom.seed({trial})\nnumbers = list(range({trial}))')/100
+                        setup=f'import random\nrandom.seed({trial})\nnumbers = list(range({trial}))', globals=globals())/100
 
         results1 = '\t'.join(f'{counts[meth]:.3f}' for meth in methods)
         results2 = '\t'.join(f'{ascending[meth]:.3f}' for meth in methods)
                        
         print (f'{trial}\t{results1}\t{results2}')
 
+def registerBenchmarks(harness):
+    """Register SkipList and AVL construction and search with benchmark.py harness."""
+    sizes = [2**_ for _ in range(4,15,2)]
+    for name, construct in [('SL', constructSL), ('AVL', constructAVL)]:
+        def searchSetup(n, construct=construct):
+            structure = construct([random.randint(0, 2 ** 12) for _ in range(n)])
+            return (structure, [random.randint(0, 2 ** 12) for _ in range(n)])
+        harness.register('skipList', f'{name}-search', search, searchSetup, sizes, number=10)
+        harness.register('skipList', f'{name}-construct', construct,
+                         lambda n: (random.sample(range(n), n),), sizes, number=10)
+    harness.register('skipList', 'SL-stress', lambda n: stressTest(SkipList(), addToSkipList, n),
+                     lambda n: (n,), sizes)
+    harness.register('skipList', 'AVL-stress', lambda n: stressTest(BinaryTree(), addToAVL, n),
+                     lambda n: (n,), sizes)
+
 if __name__ == '__main__':
     print ("Average Performance Times")
     outputPerformanceTiming()
@@ -0,0 +1,292 @@
+"""
+    Benchmark harness shared by all chapters.
+
+    Any module in a chapter directory that defines registerBenchmarks(harness)
+    is imported and asked to register the functions it wants timed, each
+    with a setup function that builds its arguments for a problem size N.
+    Because the functions themselves are registered (rather than timeit
+    strings that import from __main__), the chapter code can be imported
+    as a library.
+
+    Every benchmark is run with a fixed random seed, a number of discarded
+    warmup rounds and then a number of timed repeats, from which the median
+    and percentiles are reported. Results can be saved as JSON or CSV, and
+    a saved JSON run can serve as a baseline to flag regressions.
+
+    $ python3 benchmark.py --chapter 1 --json baseline.json
+    $ python3 benchmark.py --chapter 1 --compare baseline.json
+"""
+import argparse
+import csv
+import gc
+import importlib
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+import unittest
+
+from datetime import datetime
+from statistics import median
+
+root = os.path.dirname(os.path.abspath(__file__))
+
+def percentile(values, p):
+    """
+    Return the p-th percentile (0 to 100) of values, interpolating linearly
+    between the two closest ranks.
+    """
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * p / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+def chapterDirectories():
+    """Return dictionary of chapter number to chapter directory."""
+    chapters = {}
+    for entry in sorted(os.listdir(root)):
+        match = re.match(r'(\d+)\. ', entry)
+        if match and os.path.isdir(os.path.join(root, entry)):
+            chapters[match.group(1)] = os.path.join(root, entry)
+    return chapters
+
+class Benchmark:
+    """A function to time, with setup(n) returning its arguments for size n."""
+    def __init__(self, chapter, directory, group, name, func, setup, sizes, number):
+        self.chapter = chapter
+        self.directory = directory
+        self.group = group
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.sizes = sizes
+        self.number = number
+
+    def key(self):
+        """Return name that identifies this benchmark across runs."""
+        return f'{self.chapter}/{self.group}/{self.name}'
+
+class Harness:
+    """
+    Collect benchmarks registered by chapter modules and run them.
+    """
+    def __init__(self, warmup=1, repeats=5, seed=0):
+        self.warmup = warmup
+        self.repeats = repeats
+        self.seed = seed
+        self.benchmarks = []
+        self.results = []
+        self.chapter = None
+        self.directory = os.getcwd()
+
+    def register(self, group, name, func, setup=None, sizes=(None,), number=1):
+        """
+        Register func to be timed within group for each size in sizes. The
+        arguments for func are returned by setup(n), which is called once
+        per size (after seeding random) and is not part of the timing.
+        Each timed repeat calls func number times. sizes can also be a
+        function returning the sizes, called only when the benchmark runs,
+        for sizes that depend on data too costly to load at registration.
+        """
+        self.benchmarks.append(Benchmark(self.chapter, self.directory, group, name,
+                                         func, setup, sizes if callable(sizes) else list(sizes), number))
+
+    def load(self, chapters=None):
+        """
+        Import every module in the requested chapters (all by default) that
+        defines registerBenchmarks, and let it register its benchmarks.
+        Modules whose dependencies are not installed are skipped.
+        """
+        for chapter, directory in chapterDirectories().items():
+            if chapters and chapter not in chapters:
+                continue
+            for fileName in sorted(os.listdir(directory)):
+                if not fileName.endswith('.py'):
+                    continue
+                with open(os.path.join(directory, fileName)) as fp:
+                    if 'def registerBenchmarks(' not in fp.read():
+                        continue
+
+                self.chapter = chapter
+                self.directory = directory
+                if directory not in sys.path:
+                    sys.path.insert(0, directory)
+                cwd = os.getcwd()
+                os.chdir(directory)
+                try:
+                    module = importlib.import_module(fileName[:-3])
+                    module.registerBenchmarks(self)
+                except ImportError as e:
+                    print (f'Skipping {fileName}: {e}', file=sys.stderr)
+                finally:
+                    os.chdir(cwd)
+
+    def measure(self, bm, n):
+        """Return list of seconds per call of bm for size n, one per repeat."""
+        random.seed(self.seed)
+        args = bm.setup(n) if bm.setup else ()
+        func = bm.func
+        timings = []
+        gcEnabled = gc.isenabled()
+        gc.disable()
+        try:
+            for r in range(self.warmup + self.repeats):
+                start = time.perf_counter()
+                for _ in range(bm.number):
+                    func(*args)
+                elapsed = time.perf_counter() - start
+                if r >= self.warmup:
+                    timings.append(elapsed / bm.number)
+        finally:
+            if gcEnabled:
+                gc.enable()
+        return timings
+
+    def run(self, pattern=None):
+        """
+        Run every registered benchmark (or those whose key contains pattern)
+        and print one line for each, returning the list of results.
+        """
+        print ('Benchmark\t\t\t\tN\tMedian\t\tP90\t\tP99')
+        for bm in self.benchmarks:
+            if pattern and pattern not in bm.key():
+                continue
+            cwd = os.getcwd()
+            os.chdir(bm.directory)
+            try:
+                for n in bm.sizes() if callable(bm.sizes) else bm.sizes:
+                    timings = self.measure(bm, n)
+                    result = {
+                        'benchmark' : bm.key(),
+                        'n'         : n,
+                        'number'    : bm.number,
+                        'repeats'   : self.repeats,
+                        'min'       : min(timings),
+                        'median'    : median(timings),
+                        'p90'       : percentile(timings, 90),
+                        'p99'       : percentile(timings, 99),
+                    }
+                    self.results.append(result)
+                    print (f"{bm.key():<40}{n or '-'}\t{result['median']:.4e}\t{result['p90']:.4e}\t{result['p99']:.4e}")
+            finally:
+                os.chdir(cwd)
+        return self.results
+
+    def metadata(self):
+        """Return description of the environment and settings for this run."""
+        return {
+            'python'    : platform.python_version(),
+            'platform'  : platform.platform(),
+            'timestamp' : str(datetime.now()),
+            'warmup'    : self.warmup,
+            'repeats'   : self.repeats,
+            'seed'      : self.seed,
+        }
+
+    def writeJSON(self, path):
+        """Save results, with metadata, to path in JSON format."""
+        with open(path, 'w') as fp:
+            json.dump({'meta' : self.metadata(), 'results' : self.results}, fp, indent=2)
+
+    def writeCSV(self, path):
+        """Save results to path in CSV format, one row per benchmark and size."""
+        fields = ['benchmark', 'n', 'number', 'repeats', 'min', 'median', 'p90', 'p99']
+        with open(path, 'w', newline='') as fp:
+            writer = csv.DictWriter(fp, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.results)
+
+    def compare(self, baselinePath, threshold=0.10):
+        """
+        Compare median of each result against the same benchmark and size in
+        the JSON run saved at baselinePath. Print the ratio for each, marking
+        those more than threshold slower as REGRESSION, and return the list
+        of regressed (benchmark, n) pairs.
+        """
+        with open(baselinePath) as fp:
+            baseline = {(r['benchmark'], r['n']) : r for r in json.load(fp)['results']}
+
+        regressions = []
+        print ('Benchmark\t\t\t\tN\tBaseline\tCurrent\t\tRatio')
+        for result in self.results:
+            key = (result['benchmark'], result['n'])
+            if key not in baseline:
+                continue
+            ratio = result['median'] / baseline[key]['median']
+            flag = ''
+            if ratio > 1 + threshold:
+                flag = 'REGRESSION'
+                regressions.append(key)
+            elif ratio < 1 - threshold:
+                flag = 'improved'
+            print (f"{key[0]:<40}{key[1] or '-'}\t{baseline[key]['median']:.4e}\t{result['median']:.4e}\t{ratio:.3f}\t{flag}")
+        return regressions
+
+class HarnessTest(unittest.TestCase):
+    """
+    Unit test cases to briefly validate methods.
+    """
+    def testPercentile(self):
+        self.assertEqual(5, percentile([5], 99))
+        self.assertEqual(2.5, percentile([4, 1, 3, 2], 50))
+        self.assertAlmostEqual(3.7, percentile([1, 2, 3, 4], 90))
+
+    def testRunAndCompare(self):
+        import tempfile
+        harness = Harness(warmup=1, repeats=3)
+        harness.register('test', 'sum', sum, lambda n: (list(range(n)),), [10, 100])
+        results = harness.run()
+        self.assertEqual(2, len(results))
+        self.assertEqual([10, 100], [r['n'] for r in results])
+        self.assertTrue(results[0]['min'] <= results[0]['median'] <= results[0]['p99'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.json')
+            harness.writeJSON(path)
+            harness.writeCSV(os.path.join(directory, 'run.csv'))
+            for r in harness.results:
+                r['median'] *= 10
+            self.assertEqual(2, len(harness.compare(path)))
+
+    def testLazySizes(self):
+        calls = []
+        def sizes():
+            calls.append(1)
+            return [3, 5]
+        harness = Harness(warmup=0, repeats=1)
+        harness.register('test', 'sum', sum, lambda n: (list(range(n)),), sizes)
+        self.assertEqual([], calls)
+        self.assertEqual([3, 5], [r['n'] for r in harness.run()])
+
+def main():
+    parser = argparse.ArgumentParser(description='Run benchmarks registered by each chapter.')
+    parser.add_argument('--chapter', action='append', help='chapter number to run (repeatable)')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed rounds before timing')
+    parser.add_argument('--repeats', type=int, default=5, help='timed rounds')
+    parser.add_argument('--seed', type=int, default=0, help='random seed used before each setup')
+    parser.add_argument('--json', help='save results to this JSON file')
+    parser.add_argument('--csv', help='save results to this CSV file')
+    parser.add_argument('--compare', help='JSON file of a baseline run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='fraction slower than baseline that counts as a regression')
+    args = parser.parse_args()
+
+    harness = Harness(args.warmup, args.repeats, args.seed)
+    harness.load(args.chapter)
+    harness.run(args.filter)
+    if args.json:
+        harness.writeJSON(args.json)
+    if args.csv:
+        harness.writeCSV(args.csv)
+    if args.compare:
+        print ()
+        if harness.compare(args.compare, args.threshold):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()